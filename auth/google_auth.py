@@ -5,22 +5,56 @@ Based on proven pattern from reference project
 """
 
 import os
+import json
+import tempfile
 import time
-import gspread
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+import threading
+from datetime import datetime, timezone
+from urllib.parse import quote
 
 from utils.config import Config
 from utils.logging_config import get_logger
 from config.credentials import (
     OAUTH_CLIENT_CREDENTIALS, SCOPES, TOKEN_FILE,
-    SHEET_ID, SHEET_NAME, WORK_ORDER_FILTER_PATTERN
+    SHEET_ID, SHEET_NAME, WORK_ORDER_FILTER_PATTERN, WORK_ORDER_FILTER_RE,
+    WORK_ORDER_CACHE_DIR
 )
 
+# Optional: stream large sheet responses instead of parsing them in one go
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional: faster JSON parsing for the token file
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = get_logger('google_auth')
 
+SHEETS_VALUES_URL = "https://sheets.googleapis.com/v4/spreadsheets/{sheet_id}/values/{range}"
+
+# Refresh tokens this many seconds before they expire rather than on first failure
+TOKEN_REFRESH_MARGIN_SECONDS = 60
+
+# In-process credentials shared by every GoogleAuth instance, keyed by OAuth client + scopes
+_credentials_cache = {}
+_credentials_lock = threading.Lock()
+
+
+def _has_fresh_token(creds) -> bool:
+    """Check if credentials are valid and not within the refresh margin of expiry"""
+    if not creds or not creds.valid:
+        return False
+    if creds.expiry is None:
+        return True
+    # google-auth stores expiry as a naive UTC datetime
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    remaining = (creds.expiry - now).total_seconds()
+    return remaining > TOKEN_REFRESH_MARGIN_SECONDS
+
 
 class GoogleAuth:
     """Enhanced Google authentication and API client manager with environment variable support"""
@@ -30,6 +64,13 @@ class GoogleAuth:
         self.sheets_client = None
         self.drive_client = None
         
+        # Resolve configuration-based sheet settings once
+        self._sheet_id, self._sheet_name, self._cell_range = self._resolve_sheet_settings()
+        
+        # Spreadsheet/worksheet handles reused across calls (each open is a metadata round-trip)
+        self._spreadsheet_cache = {}
+        self._worksheet_cache = {}
+        
         # Determine OAuth credentials source
         self.oauth_credentials = self._get_oauth_credentials()
         logger.debug(f"OAuth credentials source: {'Environment variables' if self._using_env_credentials() else 'Hardcoded config'}")
@@ -54,71 +95,125 @@ class GoogleAuth:
             logger.info("Using hardcoded OAuth credentials from config/credentials.py")
             return OAUTH_CLIENT_CREDENTIALS
     
-    def authenticate(self):
-        """Authenticate with Google APIs using OAuth flow with enhanced logging"""
-        try:
-            logger.info("Starting Google authentication process")
-            creds = None
-            
-            # Check if token file exists (stored credentials)
-            if os.path.exists(TOKEN_FILE):
+    def _resolve_sheet_settings(self) -> tuple:
+        """Get (sheet ID, sheet name, cell range) from configuration, with fallbacks"""
+        sheet_id = Config.GOOGLE_SHEET_ID or SHEET_ID
+        
+        # Extract sheet name and column range from range, with fallback
+        if Config.GOOGLE_SHEET_RANGE and isinstance(Config.GOOGLE_SHEET_RANGE, str) and '!' in Config.GOOGLE_SHEET_RANGE:
+            sheet_name, cell_range = Config.GOOGLE_SHEET_RANGE.split('!', 1)
+        else:
+            sheet_name = SHEET_NAME
+            cell_range = None  # Whole sheet
+        
+        return sheet_id, sheet_name, cell_range
+    
+    def _credentials_cache_key(self) -> tuple:
+        """Key for the shared credentials cache"""
+        return (
+            self.oauth_credentials.get('client_id'),
+            self.oauth_credentials.get('client_secret'),
+            tuple(SCOPES)
+        )
+    
+    def _load_credentials(self, creds=None):
+        """Load credentials from the token file, refreshing or running the OAuth flow as needed"""
+        # Google client libraries are imported lazily to keep module import fast
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+        
+        # Check if token file exists (stored credentials)
+        if creds is None and os.path.exists(TOKEN_FILE):
+            try:
+                with open(TOKEN_FILE, 'rb') as token:
+                    token_data = token.read()
+                token_info = orjson.loads(token_data) if orjson is not None else json.loads(token_data)
+                creds = Credentials.from_authorized_user_info(token_info, SCOPES)
+                logger.debug("Loaded existing credentials from token file")
+            except Exception as e:
+                logger.warning(f"Could not load existing token: {e}")
+                # Continue without existing credentials
+        
+        # If there are no (fresh) credentials available, refresh or let the user log in
+        if not _has_fresh_token(creds):
+            if creds and creds.refresh_token:
+                logger.info("Attempting to refresh expiring Google credentials...")
                 try:
-                    creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
-                    logger.debug("Loaded existing credentials from token file")
+                    creds.refresh(Request())
+                    logger.info("✅ Google credentials refreshed successfully!")
                 except Exception as e:
-                    logger.warning(f"Could not load existing token: {e}")
-                    # Continue without existing credentials
+                    logger.error(f"Failed to refresh credentials: {e}")
+                    creds = None
             
-            # If there are no (valid) credentials available, let the user log in
             if not creds or not creds.valid:
-                if creds and creds.expired and creds.refresh_token:
-                    logger.info("Attempting to refresh expired Google credentials...")
-                    try:
-                        creds.refresh(Request())
-                        logger.info("✅ Google credentials refreshed successfully!")
-                    except Exception as e:
-                        logger.error(f"Failed to refresh credentials: {e}")
-                        creds = None
+                logger.info("Starting Google OAuth2 login flow...")
+                from google_auth_oauthlib.flow import InstalledAppFlow
                 
-                if not creds or not creds.valid:
-                    logger.info("Starting Google OAuth2 login flow...")
-                    
-                    # Create OAuth flow from selected client configuration
-                    client_config = {
-                        "installed": self.oauth_credentials
-                    }
-                    flow = InstalledAppFlow.from_client_config(
-                        client_config, SCOPES
-                    )
-                    
-                    # Run local server for OAuth flow
-                    logger.info("Opening browser for Google authentication...")
-                    creds = flow.run_local_server(port=0)
-                    logger.info("✅ Google authentication successful!")
+                # Create OAuth flow from selected client configuration
+                client_config = {
+                    "installed": self.oauth_credentials
+                }
+                flow = InstalledAppFlow.from_client_config(
+                    client_config, SCOPES
+                )
                 
-                # Save the credentials for the next run
-                try:
-                    # Create auth directory if it doesn't exist
-                    token_dir = os.path.dirname(TOKEN_FILE)
-                    if token_dir:  # Only create if directory path is not empty
-                        os.makedirs(token_dir, exist_ok=True)
-                    
-                    with open(TOKEN_FILE, 'w') as token:
-                        token.write(creds.to_json())
-                    logger.info(f"✅ Credentials saved to {TOKEN_FILE}")
-                except OSError as e:
-                    logger.warning(f"Could not create directory for token file: {e}")
-                    logger.warning("Authentication will work but tokens won't persist between sessions")
-                except Exception as e:
-                    logger.warning(f"Could not save credentials: {e}")
-                    logger.warning("Authentication will work but tokens won't persist between sessions")
+                # Run local server for OAuth flow
+                logger.info("Opening browser for Google authentication...")
+                creds = flow.run_local_server(port=0)
+                logger.info("✅ Google authentication successful!")
+            
+            # Save the credentials for the next run
+            try:
+                # Create auth directory if it doesn't exist
+                token_dir = os.path.dirname(TOKEN_FILE)
+                if token_dir:  # Only create if directory path is not empty
+                    os.makedirs(token_dir, exist_ok=True)
+                
+                with open(TOKEN_FILE, 'w') as token:
+                    token.write(creds.to_json())
+                logger.info(f"✅ Credentials saved to {TOKEN_FILE}")
+            except OSError as e:
+                logger.warning(f"Could not create directory for token file: {e}")
+                logger.warning("Authentication will work but tokens won't persist between sessions")
+            except Exception as e:
+                logger.warning(f"Could not save credentials: {e}")
+                logger.warning("Authentication will work but tokens won't persist between sessions")
+        
+        return creds
+    
+    def authenticate(self):
+        """Authenticate with Google APIs using OAuth flow with enhanced logging"""
+        try:
+            logger.info("Starting Google authentication process")
+            
+            # Reuse credentials another instance already loaded unless they are about to expire
+            cache_key = self._credentials_cache_key()
+            with _credentials_lock:
+                creds = _credentials_cache.get(cache_key)
+            
+            if _has_fresh_token(creds):
+                logger.debug("Reusing cached Google credentials")
+            else:
+                # Refresh or browser login runs outside the lock so other threads aren't blocked on the user
+                creds = self._load_credentials(creds)
+                with _credentials_lock:
+                    # Keep credentials another thread stored meanwhile if they are still fresh
+                    cached = _credentials_cache.get(cache_key)
+                    if _has_fresh_token(cached):
+                        creds = cached
+                    else:
+                        _credentials_cache[cache_key] = creds
             
             self.credentials = creds
             
             # Initialize API clients
             logger.debug("Initializing Google API clients...")
+            import gspread
+            from googleapiclient.discovery import build
             self.sheets_client = gspread.authorize(self.credentials)
             self.drive_client = build('drive', 'v3', credentials=self.credentials)
+            self._spreadsheet_cache.clear()
+            self._worksheet_cache.clear()
             
             logger.info("Google authentication completed successfully")
             return True
@@ -135,18 +230,11 @@ class GoogleAuth:
             
             logger.info("Testing Google Sheets connection...")
             
-            # Use configuration-based sheet settings
-            sheet_id = Config.GOOGLE_SHEET_ID or SHEET_ID
-            
-            # Extract sheet name from range, with fallback
-            if Config.GOOGLE_SHEET_RANGE and isinstance(Config.GOOGLE_SHEET_RANGE, str) and '!' in Config.GOOGLE_SHEET_RANGE:
-                sheet_name = Config.GOOGLE_SHEET_RANGE.split('!')[0]
-            else:
-                sheet_name = SHEET_NAME
+            sheet_id = self._sheet_id
+            sheet_name = self._sheet_name
             
-            # Try to open the configured sheet
-            sheet = self.sheets_client.open_by_key(sheet_id)
-            worksheet = sheet.worksheet(sheet_name)
+            # Try to open the configured sheet (always fresh, and primes the worksheet cache)
+            worksheet = self._get_worksheet(sheet_id, sheet_name, refresh=True)
             
             # Get basic info about the sheet
             row_count = worksheet.row_count
@@ -171,44 +259,22 @@ class GoogleAuth:
             
             logger.info("Loading work orders from Google Sheets...")
             
-            # Use configuration-based sheet settings
-            sheet_id = Config.GOOGLE_SHEET_ID or SHEET_ID
+            sheet_id, sheet_name, cell_range = self._sheet_id, self._sheet_name, self._cell_range
             
-            # Extract sheet name from range, with fallback
-            if Config.GOOGLE_SHEET_RANGE and isinstance(Config.GOOGLE_SHEET_RANGE, str) and '!' in Config.GOOGLE_SHEET_RANGE:
-                sheet_name = Config.GOOGLE_SHEET_RANGE.split('!')[0]
-            else:
-                sheet_name = SHEET_NAME
+            # Skip the download entirely if the sheet has not changed since it was cached
+            modified_time = None
+            cache_range = f"{sheet_name}!{cell_range or ''}"
+            if Config.CACHE_WORK_ORDERS:
+                modified_time = self._get_sheet_modified_time(sheet_id)
+                cached_data = self._read_work_order_cache(sheet_id, cache_range, modified_time)
+                if cached_data is not None:
+                    logger.info(f"📦 Loaded {len(cached_data)} alpha-numeric work orders from cache (sheet modified {modified_time})")
+                    return cached_data
             
-            # Open the sheet
-            sheet = self.sheets_client.open_by_key(sheet_id)
-            worksheet = sheet.worksheet(sheet_name)
+            alpha_numeric_data = list(self._iter_filtered_rows(sheet_id, sheet_name, cell_range))
             
-            # Get all records with performance tracking
-            start_time = time.time()
-            all_data = worksheet.get_all_records()
-            load_duration = time.time() - start_time
-            
-            logger.info(f"📊 Loaded {len(all_data)} total rows from Google Sheets in {load_duration:.2f}s")
-            
-            # Filter to alpha-numeric work orders (special clients)
-            import re
-            alpha_numeric_data = []
-            
-            filter_pattern = WORK_ORDER_FILTER_PATTERN
-            filter_start_time = time.time()
-            
-            for row in all_data:
-                wo_number = str(row.get('WO #', '')).strip()
-                if wo_number and re.match(filter_pattern, wo_number):
-                    alpha_numeric_data.append(row)
-            
-            filter_duration = time.time() - filter_start_time
-            logger.info(f"🔍 Filtered to {len(alpha_numeric_data)} alpha-numeric work orders (special clients) in {filter_duration:.2f}s")
-            
-            # Performance logging if enabled
-            if Config.ENABLE_PERFORMANCE_LOGGING:
-                logger.info(f"Work orders performance - Load: {load_duration:.2f}s, Filter: {filter_duration:.2f}s, Total: {load_duration + filter_duration:.2f}s")
+            if modified_time:
+                self._write_work_order_cache(sheet_id, cache_range, modified_time, alpha_numeric_data)
             
             return alpha_numeric_data
             
@@ -216,6 +282,151 @@ class GoogleAuth:
             logger.error(f"Failed to load work orders: {str(e)}")
             raise Exception(f"Failed to load work orders: {str(e)}")
     
+    def iter_work_orders(self):
+        """Yield alpha-numeric work order rows one at a time without building the full list (no caching)"""
+        if not self.sheets_client:
+            raise Exception("Not authenticated - call authenticate() first")
+        
+        yield from self._iter_filtered_rows(self._sheet_id, self._sheet_name, self._cell_range)
+    
+    def _iter_filtered_rows(self, sheet_id, sheet_name, cell_range=None):
+        """Read the sheet and yield a dict for each alpha-numeric work order row"""
+        # Get cell values for the configured range only, with performance tracking
+        # (get_all_records builds a dict for every row; we only build dicts for rows that pass the filter)
+        start_time = time.time()
+        if ijson is not None:
+            # Stream rows off the HTTP response so the full sheet is never held in memory
+            rows = self._stream_sheet_values(sheet_id, sheet_name, cell_range)
+        else:
+            worksheet = self._get_worksheet(sheet_id, sheet_name)
+            rows = iter(worksheet.get_values(cell_range))
+        
+        header = next(rows, [])
+        load_duration = time.time() - start_time
+        
+        if 'WO #' not in header:
+            logger.warning("'WO #' column not found in sheet header - no work orders to filter")
+            return
+        wo_index = header.index('WO #')
+        
+        # Filter to alpha-numeric work orders (special clients)
+        total_rows = 0
+        matched_rows = 0
+        
+        filter_match = WORK_ORDER_FILTER_RE.match
+        filter_start_time = time.time()
+        
+        for row in rows:
+            total_rows += 1
+            wo_number = row[wo_index].strip() if wo_index < len(row) else ''
+            if wo_number and filter_match(wo_number):
+                matched_rows += 1
+                yield dict(zip(header, row))
+        
+        filter_duration = time.time() - filter_start_time
+        logger.info(f"📊 Loaded {total_rows} total rows from Google Sheets in {load_duration + filter_duration:.2f}s")
+        logger.info(f"🔍 Filtered to {matched_rows} alpha-numeric work orders (special clients) in {filter_duration:.2f}s")
+        
+        # Performance logging if enabled
+        if Config.ENABLE_PERFORMANCE_LOGGING:
+            logger.info(f"Work orders performance - Load: {load_duration:.2f}s, Filter: {filter_duration:.2f}s, Total: {load_duration + filter_duration:.2f}s")
+    
+    def _get_worksheet(self, sheet_id, sheet_name, refresh=False):
+        """Get a worksheet, reusing spreadsheet/worksheet handles from earlier calls unless refresh is set"""
+        key = (sheet_id, sheet_name)
+        if refresh or key not in self._worksheet_cache:
+            sheet = None if refresh else self._spreadsheet_cache.get(sheet_id)
+            if sheet is None:
+                sheet = self.sheets_client.open_by_key(sheet_id)
+                self._spreadsheet_cache[sheet_id] = sheet
+            self._worksheet_cache[key] = sheet.worksheet(sheet_name)
+        return self._worksheet_cache[key]
+    
+    def _get_sheet_modified_time(self, sheet_id):
+        """Get the sheet's last modified time from Drive metadata, or None if unavailable"""
+        try:
+            metadata = self.drive_client.files().get(fileId=sheet_id, fields='modifiedTime').execute()
+            return metadata.get('modifiedTime')
+        except Exception as e:
+            logger.warning(f"Could not get sheet modified time, work order cache disabled: {e}")
+            return None
+    
+    def _work_order_cache_file(self, sheet_id):
+        """Path of the work order cache file for a sheet"""
+        return os.path.join(WORK_ORDER_CACHE_DIR, f"work_orders_{sheet_id}.json")
+    
+    def _read_work_order_cache(self, sheet_id, cache_range, modified_time):
+        """Return cached filtered rows if they match the sheet revision, otherwise None"""
+        if not modified_time:
+            return None
+        
+        cache_file = self._work_order_cache_file(sheet_id)
+        if not os.path.exists(cache_file):
+            return None
+        
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read work order cache: {e}")
+            return None
+        
+        if not isinstance(cached, dict):
+            logger.warning("Work order cache is not a JSON object - ignoring it")
+            return None
+        
+        if (cached.get('modified_time') != modified_time or
+                cached.get('range') != cache_range or
+                cached.get('filter_pattern') != WORK_ORDER_FILTER_PATTERN):
+            logger.debug("Work order cache is stale")
+            return None
+        
+        rows = cached.get('rows')
+        if not isinstance(rows, list):
+            logger.warning("Work order cache has no row list - ignoring it")
+            return None
+        return rows
+    
+    def _write_work_order_cache(self, sheet_id, cache_range, modified_time, rows):
+        """Atomically save filtered rows for the given sheet revision"""
+        try:
+            os.makedirs(WORK_ORDER_CACHE_DIR, exist_ok=True)
+            
+            # Write to a temp file and rename so readers never see a partial cache
+            fd, temp_path = tempfile.mkstemp(dir=WORK_ORDER_CACHE_DIR, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        'modified_time': modified_time,
+                        'range': cache_range,
+                        'filter_pattern': WORK_ORDER_FILTER_PATTERN,
+                        'rows': rows
+                    }, f)
+                os.replace(temp_path, self._work_order_cache_file(sheet_id))
+            except Exception:
+                os.remove(temp_path)
+                raise
+            
+            logger.debug(f"Cached {len(rows)} work orders for sheet revision {modified_time}")
+        except Exception as e:
+            logger.warning(f"Could not save work order cache: {e}")
+    
+    def _stream_sheet_values(self, sheet_id, sheet_name, cell_range=None):
+        """Yield sheet rows one at a time from the Sheets values API (requires ijson)"""
+        a1_range = "'{}'".format(sheet_name.replace("'", "''"))
+        if cell_range:
+            a1_range += f"!{cell_range}"
+        url = SHEETS_VALUES_URL.format(sheet_id=sheet_id, range=quote(a1_range, safe=''))
+        
+        from google.auth.transport.requests import AuthorizedSession
+        timeout = (Config.CONNECTION_TIMEOUT, Config.READ_TIMEOUT)
+        with AuthorizedSession(self.credentials) as session:
+            with session.get(url, stream=True, timeout=timeout) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                for row in ijson.items(response.raw, 'values.item'):
+                    yield row
+    
     def get_credentials_status(self):
         """Get current authentication status"""
         if not self.credentials:
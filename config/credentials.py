@@ -5,6 +5,7 @@ Based on proven pattern from reference project
 """
 
 import os
+import re
 
 # Get the directory where this script is located (config directory)
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -34,8 +35,12 @@ SCOPES = [
 # Token storage file (will be created automatically during OAuth flow)
 TOKEN_FILE = os.path.join(PROJECT_ROOT, "auth", "token.json")
 
+# Filtered work order cache (reused until the sheet's Drive modifiedTime changes)
+WORK_ORDER_CACHE_DIR = os.path.join(PROJECT_ROOT, "cache")
+
 # Work Order filtering criteria (alpha-numeric WO# pattern from PRD)
 WORK_ORDER_FILTER_PATTERN = r'^[A-Za-z]'  # Starts with letter (special clients)
+WORK_ORDER_FILTER_RE = re.compile(WORK_ORDER_FILTER_PATTERN)  # Compiled once for per-row filtering
 
 # Default application settings
 DEFAULT_EXPECTED_WO_COUNT = 5
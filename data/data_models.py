@@ -4,40 +4,109 @@ Data models for Work Order Matcher
 Clean data structures for matches, work orders, and email processing
 """
 
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
+import math
 import re
+import sys
 
+from config.credentials import WORK_ORDER_FILTER_RE
 
-@dataclass
+# Deletes every ASCII character that is not part of a number ('$', ',', spaces, letters, ...)
+_AMOUNT_DELETE_TABLE = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128) if chr(c) not in '0123456789.-'
+))
+_NON_AMOUNT_RE = re.compile(r'[^\d.-]')
+
+# Drop the per-instance __dict__ on models created per row/match (dataclass slots need Python 3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _cell_text(value: Any) -> str:
+    """Stripped text of a sheet cell, skipping str() for cells that already are strings"""
+    if type(value) is str:
+        return value.strip()
+    return str(value).strip()
+
+
+def _safe_float(value: Any, default: float = 0.0) -> float:
+    """Float from an API value, checking the type first so odd values don't go through raise+catch"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def _as_dict(value: Any) -> Dict[str, Any]:
+    """The value if it is a dict, otherwise an empty dict"""
+    return value if isinstance(value, dict) else {}
+
+
+def _as_list(value: Any) -> List[Any]:
+    """The value if it is a list, otherwise an empty list"""
+    return value if isinstance(value, list) else []
+
+
+def _clean_wo_id(value: Any) -> str:
+    """Work order ID from the API with any 'WO#' prefix removed (interned)"""
+    if not value:
+        return ''
+    return sys.intern(str(value).replace('WO#', '').strip())
+
+
+@dataclass(**_SLOTS)
 class WorkOrder:
     """Represents a work order from Google Sheets"""
     wo_id: str
     total: str
     location: str
     description: str
-    raw_data: Dict[str, Any]  # Original row data
+    clean_amount: float = field(init=False, repr=False, compare=False)  # Parsed once from total
+    
+    def __post_init__(self):
+        self.clean_amount = self._parse_amount()
     
     @classmethod
     def from_sheets_row(cls, row_data: Dict[str, Any]) -> 'WorkOrder':
         """Create WorkOrder from Google Sheets row data"""
+        get = row_data.get
         return cls(
-            wo_id=str(row_data.get('WO #', '')).strip(),
-            total=str(row_data.get('Total', '')).strip(), 
-            location=str(row_data.get('Location', '')).strip(),
-            description=str(row_data.get('Description', '')).strip(),
-            raw_data=row_data
+            wo_id=sys.intern(_cell_text(get('WO #', ''))),  # Interned for fast lookups by ID
+            total=_cell_text(get('Total', '')),
+            location=_cell_text(get('Location', '')),
+            description=_cell_text(get('Description', ''))
         )
     
+    def to_prompt_dict(self) -> Dict[str, str]:
+        """Convert back to the sheet-row dict format the matching prompt expects"""
+        return {
+            'WO #': self.wo_id,
+            'Total': self.total,
+            'Location': self.location,
+            'Description': self.description
+        }
+    
     def get_clean_amount(self) -> float:
         """Extract numeric amount from total string"""
+        return self.clean_amount
+    
+    def _parse_amount(self) -> float:
+        """Parse the numeric amount out of the total string"""
         try:
-            if not self.total or not isinstance(self.total, str):
+            if not self.total:
                 return 0.0
             
-            # Remove currency symbols and commas
-            clean_total = re.sub(r'[^\d.-]', '', str(self.total).strip())
-            if not clean_total or clean_total in ['-', '.']:
+            # Remove currency symbols and commas (from_sheets_row guarantees a str;
+            # anything else has no translate() and falls through to 0.0 below)
+            clean_total = self.total.translate(_AMOUNT_DELETE_TABLE)
+            if not clean_total.isascii():
+                # Non-ASCII leftovers (e.g. '€', non-breaking spaces) - use the full regex
+                clean_total = _NON_AMOUNT_RE.sub('', clean_total)
+            if not clean_total or clean_total in ('-', '.'):
                 return 0.0
             
             return float(clean_total)
@@ -46,10 +115,10 @@ class WorkOrder:
     
     def is_alpha_numeric(self) -> bool:
         """Check if work order ID starts with a letter (special clients)"""
-        return bool(self.wo_id and re.match(r'^[A-Za-z]', self.wo_id))
+        return bool(self.wo_id and WORK_ORDER_FILTER_RE.match(self.wo_id))
 
 
-@dataclass  
+@dataclass(**_SLOTS)
 class EmailItem:
     """Represents a billing item extracted from email"""
     description: str
@@ -62,7 +131,7 @@ class EmailItem:
             self.location_hints = []
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class MatchEvidence:
     """Evidence supporting a work order match"""
     primary_signals: List[str]
@@ -75,19 +144,26 @@ class MatchEvidence:
             self.concerns = []
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class AmountComparison:
     """Comparison between email and work order amounts"""
     email_amount: float
     wo_amount: float
     difference: float
+    _percentage_difference: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Computed once; the GUI reads it several times per match (frozen, so set via object.__setattr__)
+        if self.wo_amount == 0:
+            percentage_difference = float('inf') if self.email_amount != 0 else 0.0
+        else:
+            percentage_difference = abs(self.difference / self.wo_amount) * 100
+        object.__setattr__(self, '_percentage_difference', percentage_difference)
     
     @property
     def percentage_difference(self) -> float:
         """Calculate percentage difference"""
-        if self.wo_amount == 0:
-            return float('inf') if self.email_amount != 0 else 0.0
-        return abs(self.difference / self.wo_amount) * 100
+        return self._percentage_difference
     
     @property
     def is_exact_match(self) -> bool:
@@ -100,7 +176,7 @@ class AmountComparison:
         return self.percentage_difference <= 15.0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Match:
     """Represents a matched email item to work order"""
     email_item: str
@@ -109,33 +185,38 @@ class Match:
     evidence: MatchEvidence
     amount_comparison: AmountComparison
     work_order: Optional[WorkOrder] = None
+    _confidence_level: str = field(init=False, repr=False, compare=False)
+    _color_code: str = field(init=False, repr=False, compare=False)
+    
+    # (minimum confidence, level description, GUI color), highest band first
+    _CONFIDENCE_BANDS = (
+        (85, "Very High", "green"),
+        (70, "High", "lightgreen"),
+        (50, "Medium", "yellow"),
+    )
+    
+    def __post_init__(self):
+        # Resolved once; the GUI reads these on every redraw
+        for threshold, level, color in self._CONFIDENCE_BANDS:
+            if self.confidence >= threshold:
+                break
+        else:
+            level, color = "Low", "lightcoral"
+        self._confidence_level = level
+        self._color_code = color
     
     @property
     def confidence_level(self) -> str:
         """Get confidence level description"""
-        if self.confidence >= 85:
-            return "Very High"
-        elif self.confidence >= 70:
-            return "High"  
-        elif self.confidence >= 50:
-            return "Medium"
-        else:
-            return "Low"
+        return self._confidence_level
     
     @property
     def color_code(self) -> str:
         """Get color code for GUI display"""
-        if self.confidence >= 85:
-            return "green"
-        elif self.confidence >= 70:
-            return "lightgreen"
-        elif self.confidence >= 50:
-            return "yellow"
-        else:
-            return "lightcoral"
+        return self._color_code
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class MatchingResult:
     """Complete result from the matching process"""
     matches: List[Match]
@@ -144,16 +225,33 @@ class MatchingResult:
     success: bool
     error: Optional[str] = None
     raw_response: Optional[str] = None
+    _confidence_buckets: Optional[Tuple[List[Match], List[Match], List[Match]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def confidence_buckets(self) -> Tuple[List[Match], List[Match], List[Match]]:
+        """Split matches into (high ≥70%, medium 50-69%, low <50%) in one pass, computed once"""
+        if self._confidence_buckets is None:
+            high, medium, low = [], [], []
+            for m in self.matches:
+                if m.confidence >= 70:
+                    high.append(m)
+                elif m.confidence >= 50:
+                    medium.append(m)
+                else:
+                    low.append(m)
+            self._confidence_buckets = (high, medium, low)
+        return self._confidence_buckets
     
     @property
     def high_confidence_matches(self) -> List[Match]:
         """Get matches with high confidence (≥70%)"""
-        return [m for m in self.matches if m.confidence >= 70]
+        return self.confidence_buckets()[0]
     
     @property
     def medium_confidence_matches(self) -> List[Match]:
         """Get matches requiring review (50-69%)"""  
-        return [m for m in self.matches if 50 <= m.confidence < 70]
+        return self.confidence_buckets()[1]
     
     @property
     def total_match_count(self) -> int:
@@ -166,8 +264,9 @@ class MatchingResult:
         return len(self.unmatched_items)
     
     @classmethod
-    def from_api_response(cls, api_result: Dict[str, Any], work_orders: List[WorkOrder]) -> 'MatchingResult':
-        """Create MatchingResult from API response"""
+    def from_api_response(cls, api_result: Dict[str, Any], work_orders: List[WorkOrder],
+                          wo_lookup: Optional[Dict[str, WorkOrder]] = None) -> 'MatchingResult':
+        """Create MatchingResult from API response (pass wo_lookup to reuse a prebuilt ID index)"""
         if not api_result.get('success', False):
             return cls(
                 matches=[],
@@ -178,8 +277,9 @@ class MatchingResult:
                 raw_response=api_result.get('raw_response')
             )
         
-        # Create WorkOrder lookup
-        wo_lookup = {wo.wo_id: wo for wo in work_orders}
+        # Create WorkOrder lookup unless the caller already has one
+        if wo_lookup is None:
+            wo_lookup = {wo.wo_id: wo for wo in work_orders}
         
         # Convert API matches to Match objects
         matches = []
@@ -189,45 +289,28 @@ class MatchingResult:
                 if not isinstance(match_data, dict):
                     continue
                 
-                # Build evidence with type checking
-                evidence_data = match_data.get('evidence', {})
-                if not isinstance(evidence_data, dict):
-                    evidence_data = {}
-                
+                evidence_data = _as_dict(match_data.get('evidence'))
                 evidence = MatchEvidence(
-                    primary_signals=evidence_data.get('primary_signals', []) if isinstance(evidence_data.get('primary_signals'), list) else [],
-                    supporting_signals=evidence_data.get('supporting_signals', []) if isinstance(evidence_data.get('supporting_signals'), list) else [],
+                    primary_signals=_as_list(evidence_data.get('primary_signals')),
+                    supporting_signals=_as_list(evidence_data.get('supporting_signals')),
                     score_breakdown=str(evidence_data.get('score_breakdown', '')),
-                    concerns=evidence_data.get('concerns', []) if isinstance(evidence_data.get('concerns'), list) else []
+                    concerns=_as_list(evidence_data.get('concerns'))
                 )
                 
-                # Build amount comparison with type checking
-                amount_comp_data = match_data.get('amount_comparison', {})
-                if not isinstance(amount_comp_data, dict):
-                    amount_comp_data = {}
-                
-                def safe_float(value, default=0.0):
-                    try:
-                        return float(value) if value is not None else default
-                    except (ValueError, TypeError):
-                        return default
-                
+                amount_comp_data = _as_dict(match_data.get('amount_comparison'))
                 amount_comparison = AmountComparison(
-                    email_amount=safe_float(amount_comp_data.get('email_amount')),
-                    wo_amount=safe_float(amount_comp_data.get('wo_amount')), 
-                    difference=safe_float(amount_comp_data.get('difference'))
+                    email_amount=_safe_float(amount_comp_data.get('email_amount')),
+                    wo_amount=_safe_float(amount_comp_data.get('wo_amount')), 
+                    difference=_safe_float(amount_comp_data.get('difference'))
                 )
                 
-                # Clean work order ID
-                wo_id_raw = match_data.get('work_order_id', '')
-                wo_id = str(wo_id_raw).replace('WO#', '').strip() if wo_id_raw else ''
+                wo_id = _clean_wo_id(match_data.get('work_order_id'))
                 
                 # Validate confidence score
-                confidence_raw = match_data.get('confidence', 0)
-                try:
-                    confidence = int(float(confidence_raw))
-                    confidence = max(0, min(100, confidence))  # Clamp to 0-100
-                except (ValueError, TypeError):
+                confidence_value = _safe_float(match_data.get('confidence', 0))
+                if math.isfinite(confidence_value):
+                    confidence = max(0, min(100, int(confidence_value)))  # Clamp to 0-100
+                else:
                     confidence = 0
                 
                 match = Match(
@@ -4,13 +4,15 @@ Google Sheets client wrapper for Work Order Matcher
 Provides clean interface to Google Sheets data with WorkOrder objects
 """
 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+import csv
+import math
 import time
 from auth.google_auth import GoogleAuth
 from data.data_models import WorkOrder
 from utils.logging_config import get_logger
 from utils.config import Config
-import pandas as pd
+import numpy as np
 
 logger = get_logger('sheets_client')
 
@@ -23,6 +25,13 @@ class SheetsClient:
         logger.debug("Initializing SheetsClient")
         self.auth = GoogleAuth()
         self._authenticated = False
+        
+        # In-memory work order cache so lookups don't each trigger a Sheets round-trip
+        self._work_orders_cache: Optional[List[WorkOrder]] = None
+        self._work_order_index: Optional[Dict[str, WorkOrder]] = None  # WO ID -> cached work order
+        self._work_order_amounts: Optional[np.ndarray] = None  # clean_amount per cached work order
+        self._search_texts: Optional[List[Tuple[str, str]]] = None  # Lowercased search text per cached work order
+        self._cache_loaded_at = 0.0
         logger.debug("SheetsClient initialized")
     
     def authenticate(self) -> bool:
@@ -63,12 +72,36 @@ class SheetsClient:
             logger.error(f"❌ Connection test failed: {e}")
             return False
     
+    def _cache_is_fresh(self) -> bool:
+        """Check if the in-memory work order cache can be used"""
+        if not Config.CACHE_WORK_ORDERS or self._work_orders_cache is None:
+            return False
+        cache_age = time.time() - self._cache_loaded_at
+        return cache_age < Config.WORK_ORDER_CACHE_TIMEOUT * 60  # Timeout is in minutes
+    
+    def _clear_derived_caches(self):
+        """Drop everything built from the cached work order list"""
+        self._work_order_index = None
+        self._work_order_amounts = None
+        self._search_texts = None
+    
+    def invalidate_cache(self):
+        """Discard cached work orders so the next load fetches from Google Sheets"""
+        self._work_orders_cache = None
+        self._clear_derived_caches()
+        self._cache_loaded_at = 0.0
+        logger.debug("Work order cache invalidated")
+    
     def load_all_work_orders(self) -> List[WorkOrder]:
         """Load all work orders from Google Sheets with enhanced logging and error handling"""
         try:
             if not self._authenticated:
                 raise Exception("Not authenticated - call authenticate() first")
             
+            if self._cache_is_fresh():
+                logger.debug(f"Using {len(self._work_orders_cache)} cached work orders")
+                return self._work_orders_cache
+            
             logger.info("Loading work orders from Google Sheets")
             start_time = time.time()
             
@@ -77,19 +110,24 @@ class SheetsClient:
             data_load_duration = time.time() - start_time
             
             # Convert to WorkOrder objects
-            work_orders = []
             skipped_count = 0
             conversion_start = time.time()
             
-            for i, row in enumerate(raw_data):
-                try:
-                    wo = WorkOrder.from_sheets_row(row)
-                    work_orders.append(wo)
-                except Exception as e:
-                    # Skip malformed rows but continue processing
-                    skipped_count += 1
-                    logger.warning(f"Skipping malformed work order row {i+1}: {e}")
-                    continue
+            try:
+                # Fast path: rows are already filtered, so convert them all in one C-level map
+                work_orders = list(map(WorkOrder.from_sheets_row, raw_data))
+            except Exception:
+                # Slow path: convert row by row so malformed rows can be skipped and reported
+                work_orders = []
+                for i, row in enumerate(raw_data):
+                    try:
+                        wo = WorkOrder.from_sheets_row(row)
+                        work_orders.append(wo)
+                    except Exception as e:
+                        # Skip malformed rows but continue processing
+                        skipped_count += 1
+                        logger.warning(f"Skipping malformed work order row {i+1}: {e}")
+                        continue
             
             conversion_duration = time.time() - conversion_start
             total_duration = time.time() - start_time
@@ -99,6 +137,11 @@ class SheetsClient:
             if Config.ENABLE_PERFORMANCE_LOGGING:
                 logger.info(f"Work orders loading performance - Data: {data_load_duration:.2f}s, Conversion: {conversion_duration:.2f}s")
             
+            self._clear_derived_caches()
+            if Config.CACHE_WORK_ORDERS:
+                self._work_orders_cache = work_orders
+                self._cache_loaded_at = time.time()
+            
             return work_orders
             
         except Exception as e:
@@ -107,51 +150,100 @@ class SheetsClient:
     
     def load_alpha_numeric_work_orders(self) -> List[WorkOrder]:
         """Load only alpha-numeric work orders (special clients)"""
-        all_work_orders = self.load_all_work_orders()
-        return [wo for wo in all_work_orders if wo.is_alpha_numeric()]
+        # GoogleAuth.load_work_orders already applies WORK_ORDER_FILTER_RE to the stripped 'WO #'
+        # while reading the sheet - the same test as WorkOrder.is_alpha_numeric - so no second pass
+        return self.load_all_work_orders()
     
     def get_work_order_by_id(self, wo_id: str) -> Optional[WorkOrder]:
         """Get specific work order by ID"""
         work_orders = self.load_alpha_numeric_work_orders()
-        return next((wo for wo in work_orders if wo.wo_id == wo_id), None)
+        if work_orders is not self._work_orders_cache:
+            # Caching disabled - fall back to a linear scan
+            return next((wo for wo in work_orders if wo.wo_id == wo_id), None)
+        
+        if self._work_order_index is None:
+            # Built in reverse so the first work order wins for duplicate IDs, as with a scan
+            self._work_order_index = {wo.wo_id: wo for wo in reversed(work_orders)}
+        return self._work_order_index.get(wo_id)
     
     def get_work_orders_by_location(self, location_hint: str) -> List[WorkOrder]:
         """Get work orders matching location hint"""
         work_orders = self.load_alpha_numeric_work_orders()
         location_lower = location_hint.lower()
+        search_texts = self._get_search_texts(work_orders)
         return [
-            wo for wo in work_orders 
-            if location_lower in wo.location.lower() or location_lower in wo.description.lower()
+            wo for wo, (location_text, _) in zip(work_orders, search_texts)
+            if location_lower in location_text
         ]
     
     def get_work_orders_by_amount_range(self, target_amount: float, tolerance_percent: float = 15.0) -> List[WorkOrder]:
         """Get work orders within amount tolerance"""
         work_orders = self.load_alpha_numeric_work_orders()
-        matching_wos = []
+        amounts = self._get_amounts_array(work_orders)
         
-        for wo in work_orders:
-            wo_amount = wo.get_clean_amount()
-            if wo_amount > 0:
-                diff_percent = abs(wo_amount - target_amount) / target_amount * 100
-                if diff_percent <= tolerance_percent:
-                    matching_wos.append(wo)
+        # Vectorized: a target of 0 gives inf/nan differences, which never match
+        with np.errstate(divide='ignore', invalid='ignore'):
+            diff_percent = np.abs(amounts - target_amount) / target_amount * 100
+            in_range = (amounts > 0) & (diff_percent <= tolerance_percent)
         
-        return matching_wos
+        return [work_orders[i] for i in np.flatnonzero(in_range)]
+    
+    def filter_by_amount(self, work_orders: List[WorkOrder], amounts: Iterable[float], tolerance: float) -> List[int]:
+        """
+        Positions in work_orders whose amount is within a relative tolerance of any of the given amounts
+        
+        Work orders without a usable amount (0 or less) are always kept, so callers can still match
+        them on other fields. Positions are returned so callers can pick from lists parallel to work_orders.
+        """
+        targets = np.fromiter(amounts, dtype=np.float64)
+        wo_amounts = self._get_amounts_array(work_orders)
+        
+        in_range = (
+            (wo_amounts[:, None] >= targets * (1 - tolerance)) &
+            (wo_amounts[:, None] <= targets * (1 + tolerance))
+        ).any(axis=1)
+        return np.flatnonzero((wo_amounts <= 0) | in_range).tolist()
+    
+    def _get_amounts_array(self, work_orders: List[WorkOrder]) -> np.ndarray:
+        """Get clean amounts as a float array, reusing the one built for the cached list"""
+        if work_orders is self._work_orders_cache and self._work_order_amounts is not None:
+            return self._work_order_amounts
+        
+        amounts = np.fromiter((wo.clean_amount for wo in work_orders), dtype=np.float64, count=len(work_orders))
+        if work_orders is self._work_orders_cache:
+            self._work_order_amounts = amounts
+        return amounts
     
     def get_summary_statistics(self) -> dict:
         """Get summary statistics about work orders"""
         work_orders = self.load_all_work_orders()
-        alpha_numeric_wos = [wo for wo in work_orders if wo.is_alpha_numeric()]
         
-        total_amounts = [wo.get_clean_amount() for wo in alpha_numeric_wos if wo.get_clean_amount() > 0]
+        # Single pass over the list with running accumulators
+        alpha_numeric_count = 0
+        amount_count = 0
+        total_value = 0.0
+        min_value = math.inf
+        max_value = 0.0
+        for wo in work_orders:
+            if not wo.is_alpha_numeric():
+                continue
+            alpha_numeric_count += 1
+            amount = wo.clean_amount
+            if amount > 0:
+                amount_count += 1
+                total_value += amount
+                if amount < min_value:
+                    min_value = amount
+                if amount > max_value:
+                    max_value = amount
         
         return {
             'total_work_orders': len(work_orders),
-            'alpha_numeric_work_orders': len(alpha_numeric_wos),
-            'total_value': sum(total_amounts) if total_amounts else 0,
-            'average_value': sum(total_amounts) / len(total_amounts) if total_amounts else 0,
-            'min_value': min(total_amounts) if total_amounts else 0,
-            'max_value': max(total_amounts) if total_amounts else 0
+            'alpha_numeric_work_orders': alpha_numeric_count,
+            'total_value': total_value if amount_count else 0,
+            'average_value': total_value / amount_count if amount_count else 0,
+            'min_value': min_value if amount_count else 0,
+            'max_value': max_value if amount_count else 0
         }
     
     def export_work_orders_to_csv(self, filename: str, work_orders: Optional[List[WorkOrder]] = None):
@@ -164,19 +256,14 @@ class SheetsClient:
             return
         
         try:
-            # Convert to pandas DataFrame
-            data = []
-            for wo in work_orders:
-                data.append({
-                    'WO_ID': wo.wo_id,
-                    'Total': wo.total,
-                    'Clean_Amount': wo.get_clean_amount(),
-                    'Location': wo.location,
-                    'Description': wo.description
-                })
-            
-            df = pd.DataFrame(data)
-            df.to_csv(filename, index=False)
+            # Write rows straight to CSV
+            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(['WO_ID', 'Total', 'Clean_Amount', 'Location', 'Description'])
+                writer.writerows(
+                    (wo.wo_id, wo.total, wo.clean_amount, wo.location, wo.description)
+                    for wo in work_orders
+                )
             print(f"✅ Exported {len(work_orders)} work orders to {filename}")
             
         except Exception as e:
@@ -186,15 +273,30 @@ class SheetsClient:
         """Search work orders by term (location, description, or WO ID)"""
         work_orders = self.load_alpha_numeric_work_orders()
         search_lower = search_term.lower()
+        search_texts = self._get_search_texts(work_orders)
+        
+        return [
+            wo for wo, (_, full_text) in zip(work_orders, search_texts)
+            if search_lower in full_text
+        ]
+    
+    def _get_search_texts(self, work_orders: List[WorkOrder]) -> List[Tuple[str, str]]:
+        """
+        Get lowercased (location + description, WO ID + location + description) text per work order,
+        reusing the texts built for the cached list. Fields are joined with NUL so a search term
+        cannot match across a field boundary.
+        """
+        if work_orders is self._work_orders_cache and self._search_texts is not None:
+            return self._search_texts
         
-        matching_wos = []
+        search_texts = []
         for wo in work_orders:
-            if (search_lower in wo.wo_id.lower() or 
-                search_lower in wo.location.lower() or 
-                search_lower in wo.description.lower()):
-                matching_wos.append(wo)
+            location_text = f"{wo.location.lower()}\x00{wo.description.lower()}"
+            search_texts.append((location_text, f"{wo.wo_id.lower()}\x00{location_text}"))
         
-        return matching_wos
+        if work_orders is self._work_orders_cache:
+            self._search_texts = search_texts
+        return search_texts
     
     def get_status(self) -> dict:
         """Get client status information"""
@@ -6,6 +6,15 @@ Simple integer input for expected work order count
 
 import tkinter as tk
 from tkinter import ttk
+from functools import partial
+
+PRESET_VALUES = (1, 2, 3, 5, 10)
+
+
+def configure_styles(style: ttk.Style):
+    """Register the named label styles used by CountInputWidget (once per application)"""
+    style.configure("Bold.TLabel", font=("Segoe UI", 10, "bold"))
+    style.configure("Help.TLabel", font=("Segoe UI", 9), foreground="gray")
 
 
 class CountInputWidget:
@@ -22,6 +31,9 @@ class CountInputWidget:
         """
         self.parent = parent
         self.on_change_callback = on_change_callback
+        self._count_source = None  # count_var string the cached count was parsed from
+        self._count_value = 5
+        self._last_notified_count = None  # Last count passed to on_change_callback
         
         # Create main frame
         self.frame = ttk.Frame(parent)
@@ -36,11 +48,12 @@ class CountInputWidget:
         self.label = ttk.Label(
             self.frame, 
             text="Expected Work Orders:",
-            font=("Segoe UI", 10, "bold")
+            style="Bold.TLabel"
         )
         self.label.grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
         
-        # Spinbox for count input
+        # Spinbox for count input (validation command registered on our frame so Tk deletes it with the frame)
+        self._validate_command = self.frame.register(self._validate_input)
         self.count_var = tk.StringVar(value=str(initial_value))
         self.count_spinbox = ttk.Spinbox(
             self.frame,
@@ -50,19 +63,19 @@ class CountInputWidget:
             textvariable=self.count_var,
             command=self._on_value_change,
             validate="key",
-            validatecommand=(self.parent.register(self._validate_input), '%P')
+            validatecommand=(self._validate_command, '%P')
         )
         self.count_spinbox.grid(row=0, column=1, sticky=tk.W, padx=(0, 10))
         
-        # Bind additional events
-        self.count_var.trace('w', self._on_variable_change)
+        # Notify on committed values (arrow clicks, Enter, leaving the field) rather than every typed digit
+        self.count_spinbox.bind('<Return>', self._on_value_commit)
+        self.count_spinbox.bind('<FocusOut>', self._on_value_commit)
         
         # Help text
         help_text = ttk.Label(
             self.frame,
             text="(How many work orders do you expect to find in the email?)",
-            foreground="gray",
-            font=("Segoe UI", 9)
+            style="Help.TLabel"
         )
         help_text.grid(row=0, column=2, sticky=tk.W, padx=(10, 0))
         
@@ -73,13 +86,12 @@ class CountInputWidget:
         ttk.Label(presets_frame, text="Quick set:", foreground="gray").pack(side=tk.LEFT, padx=(0, 5))
         
         # Common preset values
-        preset_values = [1, 2, 3, 5, 10]
-        for value in preset_values:
+        for value in PRESET_VALUES:
             btn = ttk.Button(
                 presets_frame,
                 text=str(value),
                 width=3,
-                command=lambda v=value: self.set_count(v)
+                command=partial(self.set_count, value)
             )
             btn.pack(side=tk.LEFT, padx=(0, 2))
     
@@ -87,76 +99,72 @@ class CountInputWidget:
         """Validate that input is a positive integer"""
         if value == "":
             return True  # Allow empty for editing
-        try:
-            int_value = int(value)
-            return 1 <= int_value <= 99  # Reasonable range
-        except ValueError:
-            return False
+        # Checked up front so int() can't raise - this runs on every keystroke
+        return len(value) <= 2 and value.isascii() and value.isdigit() and int(value) >= 1  # 1-99
     
     def _on_value_change(self):
-        """Handle spinbox value change"""
+        """Handle spinbox arrow clicks"""
         self._trigger_callback()
     
-    def _on_variable_change(self, *args):
-        """Handle variable trace change"""
+    def _on_value_commit(self, event=None):
+        """Handle Enter or focus leaving the spinbox"""
         self._trigger_callback()
     
     def _trigger_callback(self):
-        """Trigger the change callback if set"""
+        """Trigger the change callback if set and the count changed since the last call"""
         if self.on_change_callback:
-            try:
-                count = self.get_count()
-                self.on_change_callback(count)
-            except ValueError:
-                # Invalid value, don't trigger callback
-                pass
+            count = self.get_count()
+            if count == self._last_notified_count:
+                return
+            self._last_notified_count = count
+            self.on_change_callback(count)
     
     def get_count(self) -> int:
         """Get current count value with robust error handling"""
         try:
             value = self.count_var.get()
-            if not value or not isinstance(value, str):
-                return 5  # Default if empty or wrong type
-            
-            value = value.strip()
-            if not value:
-                return 5  # Default if empty after strip
-                
-            count = int(value)
-            return max(1, min(99, count))  # Clamp to reasonable range
-        except (ValueError, AttributeError, TypeError):
-            return 5  # Default if invalid
+        except (tk.TclError, AttributeError):
+            return 5  # Default if the variable can't be read
+        if value == self._count_source:
+            return self._count_value
+        
+        self._count_source = value
+        self._count_value = self._parse_count(value)
+        return self._count_value
+    
+    @staticmethod
+    def _parse_count(value) -> int:
+        """Parse a count string, falling back to the default"""
+        if not value or not isinstance(value, str):
+            return 5  # Default if empty or wrong type
+        
+        value = value.strip()
+        if not (value.isascii() and value.isdigit()):
+            return 5  # Default if empty after strip or not a plain number (checked instead of catching ValueError)
+        
+        return max(1, min(99, int(value)))  # Clamp to reasonable range
     
     def set_count(self, count: int):
         """Set count value"""
         if 1 <= count <= 99:
             self.count_var.set(str(count))
+            self._trigger_callback()
     
     def is_valid(self) -> bool:
         """Check if current value is valid"""
-        try:
-            count = self.get_count()
-            return 1 <= count <= 99
-        except (ValueError, TypeError):
-            return False
+        # get_count never raises and clamps to 1-99, so any readable value is valid
+        return 1 <= self.get_count() <= 99
     
     def get_validation_status(self) -> dict:
         """Get validation status"""
-        try:
-            count = self.get_count()
-            return {
-                'valid': 1 <= count <= 99,
-                'value': count,
-                'in_range': 1 <= count <= 99,
-                'message': f"Will search for {count} work order{'s' if count != 1 else ''}"
-            }
-        except (ValueError, TypeError):
-            return {
-                'valid': False,
-                'value': None,
-                'in_range': False,
-                'message': "Please enter a valid number"
-            }
+        count = self.get_count()
+        in_range = 1 <= count <= 99
+        return {
+            'valid': in_range,
+            'value': count,
+            'in_range': in_range,
+            'message': f"Will search for {count} work order{'s' if count != 1 else ''}"
+        }
     
     def reset_to_default(self):
         """Reset to default value"""
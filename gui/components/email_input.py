@@ -4,9 +4,34 @@ Email input component for Work Order Matcher
 Large text area for pasting email billing text
 """
 
+import re
 import tkinter as tk
+from bisect import bisect_right
 from tkinter import ttk, scrolledtext
 
+# Idle time after the last edit before the change callback runs
+TEXT_CHANGE_DEBOUNCE_MS = 150
+
+# Character count colors: empty, too short (probably incomplete), good length, very long (might hit token limits)
+_CHAR_COUNT_THRESHOLDS = (1, 100, 5001)
+_CHAR_COUNT_COLORS = ("gray", "orange", "green", "red")
+
+# Validation hints (plain substring matches, case-insensitive, so no lowercased copy of the text is needed)
+_AMOUNT_CHARS = frozenset('$0123456789')
+_UNIT_RE = re.compile(r'unit|building|apartment|apt', re.IGNORECASE)
+_WORK_RE = re.compile(r'repair|fix|replace|install|work|labor', re.IGNORECASE)
+
+SAMPLE_EMAIL_TEXT = """Our invoice for the work is as follows:
+Unit 5966: The concrete sidewalk and drain area was cracked and needed repair
+Materials and Labor: $ 3,987.00
+
+Unit 5804: Drywall was repaired, plastered and painted due to a roof leak 
+Materials and Labor: $ 350.00
+
+Grand Total: $ 4,337.00
+
+Thank you for your business."""
+
 
 class EmailInputWidget:
     """Widget for email text input with validation and formatting"""
@@ -21,6 +46,11 @@ class EmailInputWidget:
         """
         self.parent = parent
         self.on_change_callback = on_change_callback
+        self._pending_after_id = None  # Scheduled debounced change, if any
+        self._char_count = None  # Length and color currently shown on the character count label
+        self._char_count_color = None
+        self._validation_text = None  # Text the cached validation status was computed for
+        self._validation_status = None
         
         # Create main frame
         self.frame = ttk.LabelFrame(parent, text="Email Billing Text", padding="10")
@@ -52,11 +82,9 @@ class EmailInputWidget:
         )
         self.text_area.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
         
-        # Bind text change events
+        # Bind text change events (<<Modified>> only fires on real edits, including pastes - not on clicks)
         if self.on_change_callback:
-            self.text_area.bind('<KeyRelease>', self._on_text_change)
-            self.text_area.bind('<Button-1>', self._on_text_change) 
-            self.text_area.bind('<Control-v>', self._on_paste)
+            self.text_area.bind('<<Modified>>', self._on_modified)
         
         # Character count label
         self.char_count_label = ttk.Label(self.frame, text="0 characters", foreground="gray")
@@ -75,31 +103,41 @@ class EmailInputWidget:
         self.frame.grid_rowconfigure(1, weight=1)
     
     def _on_text_change(self, event=None):
-        """Handle text change events"""
-        self._update_char_count()
+        """Handle text change events (debounced so fast typing runs the callback once)"""
+        if self._pending_after_id is not None:
+            self.frame.after_cancel(self._pending_after_id)
+        self._pending_after_id = self.frame.after(TEXT_CHANGE_DEBOUNCE_MS, self._do_change)
+    
+    def _do_change(self):
+        """Update the character count and notify the callback"""
+        self._pending_after_id = None
+        text = self.get_text()  # Fetched once for both the count and the callback
+        self._update_char_count(len(text))
         if self.on_change_callback:
-            self.on_change_callback(self.get_text())
+            self.on_change_callback(text)
     
-    def _on_paste(self, event=None):
-        """Handle paste events (delay update for paste completion)"""
-        self.frame.after(10, self._on_text_change)
+    def _on_modified(self, event=None):
+        """Handle Tk's modified flag being set"""
+        if self.text_area.edit_modified():
+            # Reset the flag so the next edit fires <<Modified>> again (the reset fires it too, with the flag off)
+            self.text_area.edit_modified(False)
+            self._on_text_change()
     
-    def _update_char_count(self):
-        """Update character count display"""
-        text_length = len(self.get_text())
+    def _update_char_count(self, text_length=None):
+        """Update character count display (pass text_length when the text was already fetched)"""
+        if text_length is None:
+            text_length = len(self.get_text())
+        if text_length == self._char_count:
+            return
+        self._char_count = text_length
         self.char_count_label.config(text=f"{text_length:,} characters")
         
         # Color coding for text length
-        if text_length == 0:
-            color = "gray"
-        elif text_length < 100:
-            color = "orange"  # Too short, probably incomplete
-        elif text_length > 5000:
-            color = "red"    # Very long, might hit token limits
-        else:
-            color = "green"   # Good length
-            
-        self.char_count_label.config(foreground=color)
+        color = _CHAR_COUNT_COLORS[bisect_right(_CHAR_COUNT_THRESHOLDS, text_length)]
+        
+        if color != self._char_count_color:
+            self._char_count_color = color
+            self.char_count_label.config(foreground=color)
     
     def get_text(self) -> str:
         """Get current text content with error handling"""
@@ -113,9 +151,8 @@ class EmailInputWidget:
     
     def set_text(self, text: str):
         """Set text content"""
-        self.text_area.delete("1.0", tk.END)
-        self.text_area.insert("1.0", text)
-        self._update_char_count()
+        self.text_area.replace("1.0", tk.END, text)  # One Tk command instead of delete + insert
+        self._update_char_count(len(text.strip()))  # Same length get_text() would report, without reading it back
     
     def clear_text(self):
         """Clear all text"""
@@ -129,21 +166,27 @@ class EmailInputWidget:
     
     def is_empty(self) -> bool:
         """Check if text area is empty"""
-        return len(self.get_text()) == 0
+        # Look for the first non-whitespace character in Tk instead of copying and stripping the buffer
+        try:
+            return not self.text_area.search(r'\S', "1.0", "end-1c", regexp=True)
+        except (tk.TclError, AttributeError):
+            return True
     
     def get_validation_status(self) -> dict:
         """Get validation status of current text"""
         text = self.get_text()
+        if text == self._validation_text:
+            return dict(self._validation_status)
         
         # Basic validation checks
-        has_amount = any(char in text for char in ['$', '0', '1', '2', '3', '4', '5', '6', '7', '8', '9'])
-        has_unit_reference = any(word in text.lower() for word in ['unit', 'building', 'apartment', 'apt'])
-        has_work_description = any(word in text.lower() for word in ['repair', 'fix', 'replace', 'install', 'work', 'labor'])
+        has_amount = not _AMOUNT_CHARS.isdisjoint(text)
+        has_unit_reference = _UNIT_RE.search(text) is not None
+        has_work_description = _WORK_RE.search(text) is not None
         
         min_length = len(text) >= 50
         reasonable_length = len(text) <= 3000
         
-        return {
+        status = {
             'valid': min_length and has_amount and reasonable_length,
             'has_amount': has_amount,
             'has_unit_reference': has_unit_reference, 
@@ -152,21 +195,13 @@ class EmailInputWidget:
             'reasonable_length': reasonable_length,
             'character_count': len(text)
         }
+        self._validation_text = text
+        self._validation_status = status
+        return dict(status)
     
     def set_sample_text(self):
         """Set sample email text for testing"""
-        sample = """Our invoice for the work is as follows:
-Unit 5966: The concrete sidewalk and drain area was cracked and needed repair
-Materials and Labor: $ 3,987.00
-
-Unit 5804: Drywall was repaired, plastered and painted due to a roof leak 
-Materials and Labor: $ 350.00
-
-Grand Total: $ 4,337.00
-
-Thank you for your business."""
-        
-        self.set_text(sample)
+        self.set_text(SAMPLE_EMAIL_TEXT)
     
     def pack(self, **kwargs):
         """Pack the frame"""
@@ -8,18 +8,50 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from typing import List, Optional
 import csv
+from bisect import bisect_right
 from datetime import datetime
 
 from data.data_models import MatchingResult, Match
 
+# Display truncation lengths
+EVIDENCE_PREVIEW_CHARS = 50
+EMAIL_ITEM_PREVIEW_CHARS = 60
+DETAIL_PREVIEW_CHARS = 100
+RAW_RESPONSE_PREVIEW_CHARS = 500
+
+# Notebook tabs in the order they are added
+_TAB_KEYS = ("matches", "unmatched", "details")
+
+# Row color tag per confidence band: <50, 50-69, 70-84, 85+
+_CONFIDENCE_THRESHOLDS = (50, 70, 85)
+_CONFIDENCE_TAGS = ("low_confidence", "medium_confidence", "good_confidence", "high_confidence")
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to limit characters, marking the cut with '...'"""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _confidence_tag(confidence: int) -> str:
+    """Matches tree row tag for a confidence score"""
+    return _CONFIDENCE_TAGS[bisect_right(_CONFIDENCE_THRESHOLDS, confidence)]
+
 
 class ResultsDisplayWidget:
     """Widget for displaying matching results with detailed information"""
     
-    def __init__(self, parent):
-        """Initialize results display widget"""
+    def __init__(self, parent, thread_manager=None):
+        """
+        Initialize results display widget
+        
+        Args:
+            parent: Parent tkinter widget
+            thread_manager: Optional ThreadManager for writing exports off the GUI thread
+        """
         self.parent = parent
+        self.thread_manager = thread_manager
         self.current_results: Optional[MatchingResult] = None
+        self._stale_tabs = set()  # Tabs (by _TAB_KEYS name) not yet filled with current_results
         
         # Create main frame
         self.frame = ttk.LabelFrame(parent, text="Matching Results", padding="10")
@@ -73,6 +105,9 @@ class ResultsDisplayWidget:
         # Details tab
         self._create_details_tab()
         
+        # Tabs are filled when first shown
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        
         # Configure grid weights
         self.frame.grid_columnconfigure(0, weight=1)
         self.frame.grid_rowconfigure(1, weight=1)
@@ -111,6 +146,12 @@ class ResultsDisplayWidget:
         matches_frame.grid_columnconfigure(0, weight=1)
         matches_frame.grid_rowconfigure(0, weight=1)
         
+        # Configure row colors
+        self.matches_tree.tag_configure("high_confidence", background="#e8f5e8")
+        self.matches_tree.tag_configure("good_confidence", background="#f0f8f0") 
+        self.matches_tree.tag_configure("medium_confidence", background="#fff8dc")
+        self.matches_tree.tag_configure("low_confidence", background="#ffe4e1")
+        
         # Bind double-click for details
         self.matches_tree.bind("<Double-1>", self._on_match_double_click)
         
@@ -185,130 +226,124 @@ class ResultsDisplayWidget:
             
         self.summary_label.config(text=summary_text)
         
-        # Populate matches
-        self._populate_matches_tree(results.matches)
-        
-        # Populate unmatched items
-        self._populate_unmatched_list(results.unmatched_items)
-        
-        # Populate analysis details
-        self._populate_details_text(results)
+        # Populate the visible tab now and the others when they are selected
+        self._stale_tabs = set(_TAB_KEYS)
+        self._populate_tab(self._selected_tab())
         
         # Enable buttons
         self.export_button.config(state="normal" if results.success else "disabled")
         self.clear_button.config(state="normal")
         
+    def _selected_tab(self) -> str:
+        """Name of the currently selected notebook tab"""
+        return _TAB_KEYS[self.notebook.index(self.notebook.select())]
+    
+    def _on_tab_changed(self, event=None):
+        """Fill the newly selected tab if it still shows older results"""
+        self._populate_tab(self._selected_tab())
+    
+    def _populate_tab(self, tab: str):
+        """Populate one tab from current_results if it is stale"""
+        if tab not in self._stale_tabs or not self.current_results:
+            return
+        self._stale_tabs.discard(tab)
+        
+        results = self.current_results
+        if tab == "matches":
+            self._populate_matches_tree(results.matches)
+        elif tab == "unmatched":
+            self._populate_unmatched_list(results.unmatched_items)
+        else:
+            self._populate_details_text(results)
+    
     def _populate_matches_tree(self, matches: List[Match]):
         """Populate the matches treeview"""
         # Clear existing items
-        for item in self.matches_tree.get_children():
-            self.matches_tree.delete(item)
-            
-        # Add matches
-        for match in matches:
-            # Format confidence with level indicator
-            confidence_text = f"{match.confidence}% ({match.confidence_level})"
-            
-            # Format amount difference
-            if match.amount_comparison.is_exact_match:
-                amount_diff = "Exact"
-            else:
-                diff = match.amount_comparison.difference
-                percent = match.amount_comparison.percentage_difference
-                amount_diff = f"${abs(diff):.2f} ({percent:.1f}%)"
-            
-            # Truncate evidence for display
-            evidence = match.evidence.score_breakdown[:50] + "..." if len(match.evidence.score_breakdown) > 50 else match.evidence.score_breakdown
-            
-            # Truncate email item for display
-            email_item = match.email_item[:60] + "..." if len(match.email_item) > 60 else match.email_item
-            
-            # Insert item
-            item_id = self.matches_tree.insert("", tk.END, values=(
-                confidence_text,
-                match.work_order_id,
-                email_item,
-                amount_diff,
-                evidence
-            ))
-            
-            # Set row color based on confidence
-            self.matches_tree.set(item_id, "Confidence", confidence_text)
-            
-            # Color coding based on confidence level
-            if match.confidence >= 85:
-                self.matches_tree.item(item_id, tags=("high_confidence",))
-            elif match.confidence >= 70:
-                self.matches_tree.item(item_id, tags=("good_confidence",))
-            elif match.confidence >= 50:
-                self.matches_tree.item(item_id, tags=("medium_confidence",))
-            else:
-                self.matches_tree.item(item_id, tags=("low_confidence",))
+        self.matches_tree.delete(*self.matches_tree.get_children())
+        
+        # Add matches (iid is the match's index, so selections map straight back to results.matches)
+        # Values and color tag go in the single insert call - one Tcl round-trip per row
+        insert = self.matches_tree.insert
+        for i, match in enumerate(matches):
+            insert("", tk.END, iid=str(i), values=self._format_row(match), tags=(_confidence_tag(match.confidence),))
+        
+    def _format_row(self, match: Match) -> tuple:
+        """Format a match as matches tree column values"""
+        # Format confidence with level indicator
+        confidence_text = f"{match.confidence}% ({match.confidence_level})"
+        
+        # Format amount difference
+        amount_comparison = match.amount_comparison
+        if amount_comparison.is_exact_match:
+            amount_diff = "Exact"
+        else:
+            amount_diff = f"${abs(amount_comparison.difference):.2f} ({amount_comparison.percentage_difference:.1f}%)"
         
-        # Configure row colors
-        self.matches_tree.tag_configure("high_confidence", background="#e8f5e8")
-        self.matches_tree.tag_configure("good_confidence", background="#f0f8f0") 
-        self.matches_tree.tag_configure("medium_confidence", background="#fff8dc")
-        self.matches_tree.tag_configure("low_confidence", background="#ffe4e1")
+        # Truncate evidence for display
+        evidence = _truncate(match.evidence.score_breakdown, EVIDENCE_PREVIEW_CHARS)
         
+        # Truncate email item for display
+        email_item = _truncate(match.email_item, EMAIL_ITEM_PREVIEW_CHARS)
+        
+        return (confidence_text, match.work_order_id, email_item, amount_diff, evidence)
+    
     def _populate_unmatched_list(self, unmatched_items: List[str]):
         """Populate the unmatched items listbox"""
         # Clear existing items
         self.unmatched_listbox.delete(0, tk.END)
         
-        # Add unmatched items
-        for item in unmatched_items:
-            # Truncate long items
-            display_item = item[:100] + "..." if len(item) > 100 else item
-            self.unmatched_listbox.insert(tk.END, display_item)
+        # Add unmatched items (truncated), all in one insert call
+        if unmatched_items:
+            self.unmatched_listbox.insert(tk.END, *(_truncate(item, DETAIL_PREVIEW_CHARS) for item in unmatched_items))
     
     def _populate_details_text(self, results: MatchingResult):
         """Populate the detailed analysis text"""
         self.details_text.config(state=tk.NORMAL)
         self.details_text.delete("1.0", tk.END)
         
-        # Analysis summary
-        details = f"WORK ORDER MATCHING ANALYSIS\n"
-        details += f"{'=' * 40}\n\n"
+        # Analysis summary (collected as parts and joined once)
+        parts = [f"WORK ORDER MATCHING ANALYSIS\n{'=' * 40}\n\n"]
+        append = parts.append
         
         if results.success:
-            details += f"Status: ✅ Analysis Successful\n"
-            details += f"Summary: {results.summary}\n\n"
-            
-            details += f"MATCH BREAKDOWN:\n"
-            details += f"• Total matches: {results.total_match_count}\n"
-            details += f"• High confidence (≥70%): {len(results.high_confidence_matches)}\n"
-            details += f"• Medium confidence (50-69%): {len(results.medium_confidence_matches)}\n"
-            details += f"• Unmatched items: {results.unmatched_count}\n\n"
-            
-            # Detailed match information
-            details += f"DETAILED MATCHES:\n"
-            details += f"{'-' * 20}\n\n"
+            append(
+                f"Status: ✅ Analysis Successful\n"
+                f"Summary: {results.summary}\n\n"
+                f"MATCH BREAKDOWN:\n"
+                f"• Total matches: {results.total_match_count}\n"
+                f"• High confidence (≥70%): {len(results.high_confidence_matches)}\n"
+                f"• Medium confidence (50-69%): {len(results.medium_confidence_matches)}\n"
+                f"• Unmatched items: {results.unmatched_count}\n\n"
+                f"DETAILED MATCHES:\n"
+                f"{'-' * 20}\n\n"
+            )
             
             for i, match in enumerate(results.matches, 1):
-                details += f"Match #{i}: {match.work_order_id}\n"
-                details += f"Confidence: {match.confidence}% ({match.confidence_level})\n"
-                details += f"Email Item: {match.email_item[:100]}...\n" if len(match.email_item) > 100 else f"Email Item: {match.email_item}\n"
-                details += f"Evidence: {match.evidence.score_breakdown}\n"
+                evidence = match.evidence
+                amount_comparison = match.amount_comparison
+                email_item = _truncate(match.email_item, DETAIL_PREVIEW_CHARS)
+                append(
+                    f"Match #{i}: {match.work_order_id}\n"
+                    f"Confidence: {match.confidence}% ({match.confidence_level})\n"
+                    f"Email Item: {email_item}\n"
+                    f"Evidence: {evidence.score_breakdown}\n"
+                )
                 
-                if match.evidence.primary_signals:
-                    details += f"Primary signals: {', '.join(match.evidence.primary_signals)}\n"
-                if match.evidence.supporting_signals:
-                    details += f"Supporting signals: {', '.join(match.evidence.supporting_signals)}\n"
+                if evidence.primary_signals:
+                    append(f"Primary signals: {', '.join(evidence.primary_signals)}\n")
+                if evidence.supporting_signals:
+                    append(f"Supporting signals: {', '.join(evidence.supporting_signals)}\n")
                 
-                details += f"Amount comparison: ${match.amount_comparison.email_amount} vs ${match.amount_comparison.wo_amount}\n"
-                details += f"\n"
+                append(f"Amount comparison: ${amount_comparison.email_amount} vs ${amount_comparison.wo_amount}\n\n")
                 
         else:
-            details += f"Status: ❌ Analysis Failed\n"
-            details += f"Error: {results.error}\n\n"
+            append(f"Status: ❌ Analysis Failed\nError: {results.error}\n\n")
             
             if results.raw_response:
-                details += f"RAW RESPONSE:\n"
-                details += f"{'-' * 15}\n"
-                details += f"{results.raw_response[:500]}...\n\n" if len(results.raw_response) > 500 else f"{results.raw_response}\n\n"
+                raw_response = _truncate(results.raw_response, RAW_RESPONSE_PREVIEW_CHARS)
+                append(f"RAW RESPONSE:\n{'-' * 15}\n{raw_response}\n\n")
         
-        self.details_text.insert("1.0", details)
+        self.details_text.insert("1.0", "".join(parts))
         self.details_text.config(state=tk.DISABLED)
         
     def _on_match_double_click(self, event):
@@ -317,47 +352,59 @@ class ResultsDisplayWidget:
         if not selection or not self.current_results:
             return
             
-        # Get selected match
-        item_index = self.matches_tree.index(selection[0])
+        # Get selected match (rows are inserted with their match index as iid)
+        item_index = int(selection[0])
         if item_index < len(self.current_results.matches):
             match = self.current_results.matches[item_index]
             self._show_match_details(match)
     
     def _show_match_details(self, match: Match):
         """Show detailed information for a specific match"""
-        details = f"Match Details: {match.work_order_id}\n"
-        details += f"{'=' * 40}\n\n"
-        details += f"Confidence: {match.confidence}% ({match.confidence_level})\n"
-        details += f"Work Order ID: {match.work_order_id}\n\n"
-        details += f"Email Item:\n{match.email_item}\n\n"
-        details += f"Evidence Breakdown:\n{match.evidence.score_breakdown}\n\n"
+        amount_comparison = match.amount_comparison
+        if amount_comparison.is_exact_match:
+            match_type = 'Exact'
+        elif amount_comparison.is_close_match:
+            match_type = 'Close'
+        else:
+            match_type = 'Different'
+        
+        parts = [
+            f"Match Details: {match.work_order_id}\n"
+            f"{'=' * 40}\n\n"
+            f"Confidence: {match.confidence}% ({match.confidence_level})\n"
+            f"Work Order ID: {match.work_order_id}\n\n"
+            f"Email Item:\n{match.email_item}\n\n"
+            f"Evidence Breakdown:\n{match.evidence.score_breakdown}\n\n"
+        ]
         
         if match.evidence.primary_signals:
-            details += f"Primary Signals:\n"
-            for signal in match.evidence.primary_signals:
-                details += f"  • {signal}\n"
-            details += "\n"
+            parts.append("Primary Signals:\n")
+            parts.extend(f"  • {signal}\n" for signal in match.evidence.primary_signals)
+            parts.append("\n")
             
         if match.evidence.supporting_signals:
-            details += f"Supporting Signals:\n"
-            for signal in match.evidence.supporting_signals:
-                details += f"  • {signal}\n"
-            details += "\n"
-        
-        details += f"Amount Analysis:\n"
-        details += f"  Email Amount: ${match.amount_comparison.email_amount:.2f}\n"
-        details += f"  Work Order Amount: ${match.amount_comparison.wo_amount:.2f}\n"
-        details += f"  Difference: ${match.amount_comparison.difference:.2f}\n"
-        details += f"  Percentage Diff: {match.amount_comparison.percentage_difference:.1f}%\n"
-        details += f"  Match Type: {'Exact' if match.amount_comparison.is_exact_match else 'Close' if match.amount_comparison.is_close_match else 'Different'}\n"
+            parts.append("Supporting Signals:\n")
+            parts.extend(f"  • {signal}\n" for signal in match.evidence.supporting_signals)
+            parts.append("\n")
+        
+        parts.append(
+            f"Amount Analysis:\n"
+            f"  Email Amount: ${amount_comparison.email_amount:.2f}\n"
+            f"  Work Order Amount: ${amount_comparison.wo_amount:.2f}\n"
+            f"  Difference: ${amount_comparison.difference:.2f}\n"
+            f"  Percentage Diff: {amount_comparison.percentage_difference:.1f}%\n"
+            f"  Match Type: {match_type}\n"
+        )
         
         if match.work_order:
-            details += f"\nWork Order Details:\n"
-            details += f"  Location: {match.work_order.location}\n"
-            details += f"  Description: {match.work_order.description}\n"
+            parts.append(
+                f"\nWork Order Details:\n"
+                f"  Location: {match.work_order.location}\n"
+                f"  Description: {match.work_order.description}\n"
+            )
         
         # Show in message dialog
-        messagebox.showinfo("Match Details", details)
+        messagebox.showinfo("Match Details", "".join(parts))
     
     def _export_results(self):
         """Export results to CSV file"""
@@ -379,54 +426,86 @@ class ResultsDisplayWidget:
         if not filename:
             return
             
+        results = self.current_results
+        if self.thread_manager:
+            # Write in the background; callbacks run on the GUI thread via the task processor
+            self.export_button.config(state="disabled")
+            success = self.thread_manager.submit_task(
+                task_id="export_results",
+                func=self._write_export_csv,
+                args=(filename, results),
+                on_success=self._on_export_success,
+                on_error=self._on_export_error,
+                on_complete=lambda task: self._on_export_complete(results)
+            )
+            if success:
+                return
+            self._on_export_complete(results)
+        
+        # Fallback: write synchronously
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                
-                # Write header
-                writer.writerow([
-                    "Work_Order_ID", "Confidence_Percent", "Confidence_Level",
-                    "Email_Item", "Email_Amount", "WO_Amount", "Amount_Difference",
-                    "Score_Breakdown", "Primary_Signals", "Supporting_Signals"
-                ])
-                
-                # Write matches
-                for match in self.current_results.matches:
-                    writer.writerow([
-                        match.work_order_id,
-                        match.confidence,
-                        match.confidence_level,
-                        match.email_item,
-                        match.amount_comparison.email_amount,
-                        match.amount_comparison.wo_amount,
-                        match.amount_comparison.difference,
-                        match.evidence.score_breakdown,
-                        "; ".join(match.evidence.primary_signals),
-                        "; ".join(match.evidence.supporting_signals)
-                    ])
-                
-                # Write unmatched items section
-                if self.current_results.unmatched_items:
-                    writer.writerow([])  # Empty row
-                    writer.writerow(["UNMATCHED_ITEMS"])
-                    for item in self.current_results.unmatched_items:
-                        writer.writerow([item])
-            
-            messagebox.showinfo("Export Complete", f"Results exported to:\n{filename}")
-            
+            self._on_export_success(self._write_export_csv(filename, results))
         except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export results:\n{str(e)}")
+            self._on_export_error(e)
+    
+    def _iter_export_rows(self, results: MatchingResult):
+        """Yield CSV rows for the given results (header, matches, then unmatched items)"""
+        yield [
+            "Work_Order_ID", "Confidence_Percent", "Confidence_Level",
+            "Email_Item", "Email_Amount", "WO_Amount", "Amount_Difference",
+            "Score_Breakdown", "Primary_Signals", "Supporting_Signals"
+        ]
+        
+        for match in results.matches:
+            yield [
+                match.work_order_id,
+                match.confidence,
+                match.confidence_level,
+                match.email_item,
+                match.amount_comparison.email_amount,
+                match.amount_comparison.wo_amount,
+                match.amount_comparison.difference,
+                match.evidence.score_breakdown,
+                "; ".join(match.evidence.primary_signals),
+                "; ".join(match.evidence.supporting_signals)
+            ]
+        
+        # Unmatched items section
+        if results.unmatched_items:
+            yield []  # Empty row
+            yield ["UNMATCHED_ITEMS"]
+            for item in results.unmatched_items:
+                yield [item]
+    
+    def _write_export_csv(self, filename: str, results: MatchingResult) -> str:
+        """Stream the export rows to a CSV file (safe to run off the GUI thread)"""
+        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+            csv.writer(csvfile).writerows(self._iter_export_rows(results))
+        return filename
+    
+    def _on_export_success(self, filename: str):
+        """Report a finished export"""
+        messagebox.showinfo("Export Complete", f"Results exported to:\n{filename}")
+    
+    def _on_export_error(self, error: Exception):
+        """Report a failed export"""
+        messagebox.showerror("Export Error", f"Failed to export results:\n{str(error)}")
+    
+    def _on_export_complete(self, results: MatchingResult):
+        """Re-enable export if the exported results are still displayed"""
+        if self.current_results is results and results.success:
+            self.export_button.config(state="normal")
     
     def _clear_results(self):
         """Clear all results"""
         self.current_results = None
+        self._stale_tabs.clear()
         
         # Clear summary
         self.summary_label.config(text="No analysis run yet")
         
         # Clear matches tree
-        for item in self.matches_tree.get_children():
-            self.matches_tree.delete(item)
+        self.matches_tree.delete(*self.matches_tree.get_children())
         
         # Clear unmatched list
         self.unmatched_listbox.delete(0, tk.END)
@@ -6,26 +6,41 @@ Integrates all GUI components with the matching system
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+from collections import OrderedDict, namedtuple
+import hashlib
+import re
 import threading
 import sys
 import os
 import time
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add project root to path when run directly (main.py already puts it on sys.path)
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from gui.components.email_input import EmailInputWidget
-from gui.components.count_input import CountInputWidget  
+from gui.components.count_input import CountInputWidget, configure_styles as configure_count_styles
 from gui.components.results_display import ResultsDisplayWidget
-from data.sheets_client import SheetsClient
-from llm.anthropic_client import AnthropicClient
 from data.data_models import MatchingResult, WorkOrder
+from llm.prompt_builder import PromptBuilder
 from utils.logging_config import get_logger
 from utils.thread_manager import get_thread_manager
 from utils.config import Config
 
 logger = get_logger('main_window')
 
+# Indeterminate progress animation: a 50 ms step over a 20-step cycle keeps the 1 s sweep of the
+# default 10 ms x 100 steps while redrawing the bar 5x less often during long API calls
+PROGRESS_STEP_MS = 50
+PROGRESS_STEPS_PER_CYCLE = 20
+
+# Dollar amounts in email text: "$1,250" / "$ 450.00", or bare figures with cents such as "450.00"
+_EMAIL_AMOUNT_RE = re.compile(r'\$\s*(\d[\d,]*(?:\.\d{2})?)|\b(\d[\d,]*\.\d{2})\b')
+
+# Most recent successful analyses kept for repeated Find Matches clicks on the same input
+MATCHING_RESULT_CACHE_SIZE = 32
+_MatchingCacheKey = namedtuple('_MatchingCacheKey', 'email_digest expected_count prefilter version')
+
 
 class WorkOrderMatcherApp:
     """Main application window for Work Order Matcher"""
@@ -44,10 +59,17 @@ class WorkOrderMatcherApp:
         
         logger.debug(f"Window configured: {geometry}, min size: {Config.MIN_WINDOW_WIDTH}x{Config.MIN_WINDOW_HEIGHT}")
         
-        # Initialize clients
-        self.sheets_client = SheetsClient()
-        self.anthropic_client = AnthropicClient()
+        # API clients are imported and created on first use from a worker thread (see _get_sheets_client
+        # and _get_anthropic_client) so the window is not held up by the Google and Anthropic SDKs
+        self.sheets_client = None
+        self.anthropic_client = None
+        self._client_lock = threading.Lock()
         self.work_orders = []
+        self.work_order_lookup = {}
+        self._work_orders_payload = []  # self.work_orders in the dict format sent to the API, rebuilt with it
+        self._work_orders_summary = PromptBuilder.format_work_orders([])  # Prompt text for the payload, rebuilt with it
+        self._work_orders_version = 0  # Bumped whenever self.work_orders is replaced
+        self._result_cache = OrderedDict()  # _MatchingCacheKey -> MatchingResult
         
         # Initialize thread manager with error handling
         try:
@@ -66,6 +88,7 @@ class WorkOrderMatcherApp:
         
         # State tracking
         self.matching_in_progress = False
+        self._widget_options = {}  # Last options set per widget, to skip no-op config() calls
         
         # Set up GUI
         self._setup_gui()
@@ -124,9 +147,10 @@ class WorkOrderMatcherApp:
         subtitle_label.grid(row=1, column=0, sticky=tk.W)
         
         # System status
+        self._system_status_var = tk.StringVar(value="🔄 Loading work orders...")
         self.system_status_label = ttk.Label(
             header_frame,
-            text="🔄 Loading work orders...",
+            textvariable=self._system_status_var,
             font=("Segoe UI", 10),
             foreground="orange"
         )
@@ -210,6 +234,7 @@ class WorkOrderMatcherApp:
         self.progress_bar = ttk.Progressbar(
             controls_frame,
             mode='indeterminate',
+            maximum=PROGRESS_STEPS_PER_CYCLE,
             style="success.Horizontal.TProgressbar"
         )
         self.progress_bar.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
@@ -221,7 +246,7 @@ class WorkOrderMatcherApp:
         parent.grid_rowconfigure(0, weight=1)
         
         # Results display widget
-        self.results_display = ResultsDisplayWidget(parent)
+        self.results_display = ResultsDisplayWidget(parent, thread_manager=self.thread_manager)
         self.results_display.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
     def _create_status_bar(self):
@@ -231,17 +256,19 @@ class WorkOrderMatcherApp:
         status_frame.grid_columnconfigure(1, weight=1)
         
         # Work orders count
+        self._wo_count_var = tk.StringVar(value="Work Orders: Loading...")
         self.wo_count_label = ttk.Label(
             status_frame,
-            text="Work Orders: Loading...",
+            textvariable=self._wo_count_var,
             font=("Segoe UI", 9)
         )
         self.wo_count_label.grid(row=0, column=0, padx=(10, 20))
         
         # Status message (expandable)
+        self._status_var = tk.StringVar(value="Ready")
         self.status_label = ttk.Label(
             status_frame,
-            text="Ready",
+            textvariable=self._status_var,
             font=("Segoe UI", 9),
             foreground="gray"
         )
@@ -274,6 +301,9 @@ class WorkOrderMatcherApp:
         tools_menu.add_command(label="Reload Work Orders", command=self._reload_work_orders)
         tools_menu.add_command(label="Test Connections", command=self._test_connections)
         tools_menu.add_separator()
+        self._prefilter_var = tk.BooleanVar(value=Config.PREFILTER_WORK_ORDERS_BY_AMOUNT)
+        tools_menu.add_checkbutton(label="Prefilter Work Orders by Amount", variable=self._prefilter_var)
+        tools_menu.add_separator()
         tools_menu.add_command(label="Clear All Data", command=self._clear_all)
         
         # Help menu
@@ -299,19 +329,36 @@ class WorkOrderMatcherApp:
         if self.thread_manager:
             self.root.after(100, process_tasks)
 
+    def _get_sheets_client(self):
+        """Return the Google Sheets client, importing and creating it on first use"""
+        with self._client_lock:
+            if self.sheets_client is None:
+                from data.sheets_client import SheetsClient
+                self.sheets_client = SheetsClient()
+            return self.sheets_client
+    
+    def _get_anthropic_client(self):
+        """Return the Anthropic client, importing and creating it on first use"""
+        with self._client_lock:
+            if self.anthropic_client is None:
+                from llm.anthropic_client import AnthropicClient
+                self.anthropic_client = AnthropicClient()
+            return self.anthropic_client
+    
     def _load_work_orders_async(self):
         """Load work orders in background using thread manager"""
         def load_work_orders():
             logger.info("Starting work orders loading task")
-            self._update_status("Connecting to Google Sheets...")
+            self._post_status("Connecting to Google Sheets...")
             
             # Authenticate and load work orders
-            if not self.sheets_client.authenticate():
+            sheets_client = self._get_sheets_client()
+            if not sheets_client.authenticate():
                 logger.error("Google Sheets authentication failed")
                 raise Exception("Google Sheets authentication failed")
             
-            self._update_status("Loading work orders...")
-            work_orders = self.sheets_client.load_alpha_numeric_work_orders()
+            self._post_status("Loading work orders...")
+            work_orders = sheets_client.load_alpha_numeric_work_orders()
             logger.info(f"Successfully loaded {len(work_orders)} work orders")
             return work_orders
         
@@ -341,6 +388,11 @@ class WorkOrderMatcherApp:
     def _on_work_orders_loaded(self, work_orders):
         """Handle successful work orders loading"""
         self.work_orders = work_orders
+        self.work_order_lookup = {wo.wo_id: wo for wo in work_orders}
+        self._work_orders_payload = [wo.to_prompt_dict() for wo in work_orders]
+        self._work_orders_summary = PromptBuilder.format_work_orders(self._work_orders_payload)
+        self._work_orders_version += 1
+        self._result_cache.clear()  # Results for the old work orders can't be reused
         count = len(work_orders)
         
         logger.info(f"Work orders loaded successfully: {count} alpha-numeric work orders")
@@ -350,7 +402,7 @@ class WorkOrderMatcherApp:
         self._update_system_status("✅ System ready", "green")
         
         # Enable find matches button
-        self.find_matches_button.config(state="normal")
+        self._configure(self.find_matches_button, state="normal")
     
     def _on_work_orders_error(self, error):
         """Handle work orders loading error"""
@@ -362,7 +414,7 @@ class WorkOrderMatcherApp:
         self._update_system_status("❌ System error", "red")
         
         # Keep button disabled
-        self.find_matches_button.config(state="disabled")
+        self._configure(self.find_matches_button, state="disabled")
     
     def _find_matches(self):
         """Main matching function"""
@@ -381,37 +433,74 @@ class WorkOrderMatcherApp:
             return
         
         expected_count = self.count_input.get_count()
+        prefilter = self._prefilter_var.get()
+        
+        # Same email, count and work orders as an earlier successful run - show that result again
+        cache_key = None
+        if Config.CACHE_MATCHING_RESULTS:
+            email_digest = hashlib.blake2b(email_text.encode('utf-8'), digest_size=16).digest()
+            cache_key = _MatchingCacheKey(email_digest, expected_count, prefilter, self._work_orders_version)
+            cached_result = self._result_cache.get(cache_key)
+            if cached_result is not None:
+                logger.info("Reusing cached matching result for unchanged email and work orders")
+                self._result_cache.move_to_end(cache_key)
+                self._on_matching_completed(cached_result)
+                return
         
         # Start matching in background
-        self._start_matching_async(email_text, expected_count)
+        self._start_matching_async(email_text, expected_count, cache_key, prefilter)
     
-    def _start_matching_async(self, email_text, expected_count):
+    def _prefilter_work_orders(self, email_text, expected_count):
+        """
+        Narrow the work order payload to rows whose Total is close to a dollar amount in the email
+        
+        Returns:
+            (payload, wo_summary) to send to the API - the full preloaded pair when filtering can't be
+            trusted: fewer amounts than expected matches (some items have no amount to filter on)
+            or no work order in range
+        """
+        amounts = set()
+        for match in _EMAIL_AMOUNT_RE.finditer(email_text):
+            amount = float((match.group(1) or match.group(2)).replace(',', ''))
+            if amount > 0:
+                amounts.add(amount)
+        
+        if len(amounts) < expected_count:
+            return self._work_orders_payload, self._work_orders_summary
+        
+        # Work orders without a usable Total stay in - the model can still match them on unit/address
+        keep = self._get_sheets_client().filter_by_amount(
+            self.work_orders, amounts, Config.PREFILTER_AMOUNT_TOLERANCE
+        )
+        payload = [self._work_orders_payload[i] for i in keep]
+        if not payload:
+            return self._work_orders_payload, self._work_orders_summary
+        
+        logger.info(f"Amount prefilter kept {len(payload)} of {len(self._work_orders_payload)} work orders")
+        return payload, PromptBuilder.format_work_orders(payload)
+    
+    def _start_matching_async(self, email_text, expected_count, cache_key=None, prefilter=False):
         """Start matching process using thread manager with input sanitization"""
         def run_matching():
             logger.info(f"Starting matching analysis with {len(self.work_orders)} work orders, expecting {expected_count} matches")
             
-            # Convert WorkOrder objects to dict format for API
-            work_orders_dict = []
-            for wo in self.work_orders:
-                wo_dict = {
-                    'WO #': wo.wo_id,
-                    'Total': wo.total,
-                    'Location': wo.location,
-                    'Description': wo.description
-                }
-                work_orders_dict.append(wo_dict)
+            if prefilter:
+                payload, wo_summary = self._prefilter_work_orders(email_text, expected_count)
+            else:
+                payload, wo_summary = self._work_orders_payload, self._work_orders_summary
             
             # Call Anthropic client (which now handles input sanitization internally)
-            result = self.anthropic_client.find_matches(
+            result = self._get_anthropic_client().find_matches(
                 email_text=email_text,
-                work_orders=work_orders_dict,
-                expected_count=expected_count
+                work_orders=payload,
+                expected_count=expected_count,
+                wo_summary=wo_summary
             )
             
             logger.debug(f"API response received: success={result.get('success', False)}")
             
             # Convert to MatchingResult object
-            matching_result = MatchingResult.from_api_response(result, self.work_orders)
+            matching_result = MatchingResult.from_api_response(result, self.work_orders, self.work_order_lookup)
             
             return matching_result
         
@@ -420,7 +509,7 @@ class WorkOrderMatcherApp:
             success = self.thread_manager.submit_task(
                 task_id="matching_analysis", 
                 func=run_matching,
-                on_success=self._on_matching_completed,
+                on_success=lambda result: self._on_matching_completed(result, cache_key),
                 on_error=self._on_matching_error,
                 on_complete=lambda task: self._on_matching_finished()
             )
@@ -438,7 +527,7 @@ class WorkOrderMatcherApp:
             self._on_matching_started()
             try:
                 result = run_matching()
-                self._on_matching_completed(result)
+                self._on_matching_completed(result, cache_key)
             except Exception as e:
                 self._on_matching_error(e)
             finally:
@@ -447,16 +536,22 @@ class WorkOrderMatcherApp:
     def _on_matching_started(self):
         """Handle matching process start"""
         self.matching_in_progress = True
-        self.find_matches_button.config(state="disabled", text="🔍 Analyzing...")
+        self._configure(self.find_matches_button, state="disabled", text="🔍 Analyzing...")
         self.progress_bar.grid()  # Show progress bar
-        self.progress_bar.start(10)  # Start animation
+        self.progress_bar.start(PROGRESS_STEP_MS)  # Start animation
         self._update_status("🤖 Analyzing email with Claude AI...", "blue")
     
-    def _on_matching_completed(self, result: MatchingResult):
-        """Handle successful matching completion"""
+    def _on_matching_completed(self, result: MatchingResult, cache_key=None):
+        """Handle successful matching completion (cache_key stores a successful result for reuse)"""
         logger.info(f"Matching completed successfully: {result.total_match_count} matches, {result.unmatched_count} unmatched")
         
         if result.success:
+            # Only cache if the work orders weren't reloaded while the request was running
+            if cache_key is not None and cache_key.version == self._work_orders_version:
+                self._result_cache[cache_key] = result
+                if len(self._result_cache) > MATCHING_RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+            
             # Display results
             self.results_display.display_results(result)
             
@@ -484,7 +579,7 @@ class WorkOrderMatcherApp:
         logger.debug("Matching process finished, updating UI state")
         
         self.matching_in_progress = False
-        self.find_matches_button.config(state="normal", text="🔍 Find Matches")
+        self._configure(self.find_matches_button, state="normal", text="🔍 Find Matches")
         self.progress_bar.stop()
         self.progress_bar.grid_remove()  # Hide progress bar
     
@@ -513,7 +608,9 @@ class WorkOrderMatcherApp:
             return
             
         self._update_system_status("🔄 Reloading...", "orange")
-        self.find_matches_button.config(state="disabled")
+        self._configure(self.find_matches_button, state="disabled")
+        if self.sheets_client is not None:
+            self.sheets_client.invalidate_cache()
         self._load_work_orders_async()
     
     def _test_connections(self):
@@ -522,31 +619,46 @@ class WorkOrderMatcherApp:
             return
             
         def test_all():
+            # Test Google Sheets
+            sheets_ok = self._get_sheets_client().test_connection()
+            
+            # Test Anthropic
+            anthropic_result = self._get_anthropic_client().test_connection()
+            anthropic_ok = anthropic_result.get('success', False)
+            return sheets_ok, anthropic_ok
+        
+        def on_success(result):
+            sheets_ok, anthropic_ok = result
+            
+            # Report results
+            status = "✅ All connections working" if sheets_ok and anthropic_ok else "⚠️ Some connections failed"
+            color = "green" if sheets_ok and anthropic_ok else "orange"
+            
+            details = f"Google Sheets: {'✅' if sheets_ok else '❌'}\n"
+            details += f"Anthropic API: {'✅' if anthropic_ok else '❌'}"
+            
+            self._update_status(status, color)
+            messagebox.showinfo("Connection Test", details)
+        
+        def on_error(error):
+            messagebox.showerror("Connection Test Failed", str(error))
+        
+        self._update_status("Testing connections...", "blue")
+        
+        # Submit task to thread manager or run synchronously if unavailable
+        if self.thread_manager:
+            if not self.thread_manager.submit_task(
+                task_id="test_connections",
+                func=test_all,
+                on_success=on_success,
+                on_error=on_error
+            ):
+                self._update_status("❌ Failed to start connection test", "red")
+        else:
             try:
-                self.root.after(0, lambda: self._update_status("Testing connections...", "blue"))
-                
-                # Test Google Sheets
-                sheets_ok = self.sheets_client.test_connection()
-                
-                # Test Anthropic
-                anthropic_result = self.anthropic_client.test_connection()
-                anthropic_ok = anthropic_result.get('success', False)
-                
-                # Report results
-                status = "✅ All connections working" if sheets_ok and anthropic_ok else "⚠️ Some connections failed"
-                color = "green" if sheets_ok and anthropic_ok else "orange"
-                
-                details = f"Google Sheets: {'✅' if sheets_ok else '❌'}\n"
-                details += f"Anthropic API: {'✅' if anthropic_ok else '❌'}"
-                
-                self.root.after(0, lambda: self._update_status(status, color))
-                self.root.after(0, lambda: messagebox.showinfo("Connection Test", details))
-                
+                on_success(test_all())
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror("Connection Test Failed", str(e)))
-        
-        thread = threading.Thread(target=test_all, daemon=True)
-        thread.start()
+                on_error(e)
     
     def _show_about(self):
         """Show about dialog"""
@@ -576,24 +688,41 @@ Powered by:
         not_processing = not self.matching_in_progress
         
         button_enabled = has_content and has_work_orders and not_processing
-        self.find_matches_button.config(state="normal" if button_enabled else "disabled")
+        self._configure(self.find_matches_button, state="normal" if button_enabled else "disabled")
     
     def _on_count_change(self, count):
         """Handle count input changes"""
         # Could add validation or other logic here
         pass
     
+    def _configure(self, widget, **options):
+        """Apply widget options, skipping the Tk call when they are already set"""
+        last = self._widget_options.setdefault(str(widget), {})
+        changed = {key: value for key, value in options.items() if last.get(key) != value}
+        if changed:
+            widget.config(**changed)
+            last.update(changed)
+    
+    def _post_status(self, message, color="gray"):
+        """Update the status bar from a worker thread (through the thread manager's GUI queue)"""
+        if self.thread_manager:
+            self.thread_manager.post_to_gui(self._update_status, message, color)
+        else:
+            self._update_status(message, color)
+    
     def _update_status(self, message, color="gray"):
         """Update status bar message"""
-        self.status_label.config(text=message, foreground=color)
+        self._status_var.set(message)
+        self._configure(self.status_label, foreground=color)
     
     def _update_system_status(self, message, color="gray"):
         """Update system status in header"""
-        self.system_status_label.config(text=message, foreground=color)
+        self._system_status_var.set(message)
+        self._configure(self.system_status_label, foreground=color)
     
     def _update_wo_count(self, message):
         """Update work orders count"""
-        self.wo_count_label.config(text=message)
+        self._wo_count_var.set(message)
     
     def _on_closing(self):
         """Handle application closing"""
@@ -620,6 +749,7 @@ def create_application():
     except:
         # Fallback to default
         style.theme_use('default')
+    configure_count_styles(style)
     
     # Create application
     app = WorkOrderMatcherApp(root)
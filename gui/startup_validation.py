@@ -9,8 +9,9 @@ from tkinter import messagebox
 import sys
 import os
 
-# Add project root to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add project root to path for imports when run directly (main.py already puts it on sys.path)
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Initialize logging for startup validation with better error handling
 logger = None
@@ -40,7 +40,8 @@ class AnthropicClient:
         self._total_tokens_used = 0
         self._total_api_time = 0.0
     
-    def find_matches(self, email_text: str, work_orders: List[Dict], expected_count: int = 5) -> Dict[str, Any]:
+    def find_matches(self, email_text: str, work_orders: List[Dict], expected_count: int = 5,
+                     wo_summary: Optional[str] = None) -> Dict[str, Any]:
         """
         Find work order matches for email billing text using blended confidence scoring with input sanitization
         
@@ -48,6 +49,7 @@ class AnthropicClient:
             email_text: Raw email text from user input
             work_orders: List of alpha-numeric work orders from Google Sheets
             expected_count: Expected number of matches to find
+            wo_summary: Pre-formatted work order block from PromptBuilder.format_work_orders(work_orders)
             
         Returns:
             Dict with matches, unmatched items, and processing info
@@ -87,7 +89,8 @@ class AnthropicClient:
             prompt = self.prompt_builder.build_matching_prompt(
                 email_text=sanitized_text,
                 work_orders=work_orders,
-                expected_count=expected_count
+                expected_count=expected_count,
+                wo_summary=wo_summary
             )
             
             # Log prompt info (without sensitive data)
@@ -205,7 +208,7 @@ class AnthropicClient:
                     raise ValueError("Empty response from Claude")
                     
             except anthropic.RateLimitError as e:
-                wait_time = min((attempt + 1) * 2, 30)  # Cap at 30 seconds
+                wait_time = min(self._retry_after_seconds(e, (attempt + 1) * 2), 30)  # Cap at 30 seconds
                 logger.warning(f"Rate limit hit on attempt {attempt + 1}/{self.max_retries}, waiting {wait_time}s")
                 if attempt < self.max_retries - 1:
                     time.sleep(wait_time)
@@ -229,6 +232,18 @@ class AnthropicClient:
         
         return None
     
+    @staticmethod
+    def _retry_after_seconds(error: Exception, default: float) -> float:
+        """Wait time the API asked for in its retry-after header, or the default backoff"""
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None)
+        if headers is not None:
+            try:
+                return max(float(headers.get('retry-after', default)), 0.0)
+            except (TypeError, ValueError):
+                pass
+        return default
+    
     def test_connection(self) -> Dict[str, Any]:
         """
         Test the connection to Anthropic API
@@ -6,7 +6,7 @@ Implements blended confidence scoring system for intelligent matching
 
 import json
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 
 class PromptBuilder:
@@ -38,7 +38,8 @@ class PromptBuilder:
     }
 
     @staticmethod
-    def build_matching_prompt(email_text: str, work_orders: List[Dict], expected_count: int = 5) -> str:
+    def build_matching_prompt(email_text: str, work_orders: List[Dict], expected_count: int = 5,
+                              wo_summary: Optional[str] = None) -> str:
         """
         Build the main prompt for work order matching with blended confidence scoring
         
@@ -46,13 +47,15 @@ class PromptBuilder:
             email_text: Raw email text from user
             work_orders: List of filtered alpha-numeric work orders from Google Sheets
             expected_count: Expected number of matches to find
+            wo_summary: work_orders already run through format_work_orders, if the caller keeps one
             
         Returns:
             Complete prompt string for Claude
         """
         
         # Format work orders for the prompt
-        wo_summary = PromptBuilder._format_work_orders(work_orders)
+        if wo_summary is None:
+            wo_summary = PromptBuilder.format_work_orders(work_orders)
         
         prompt = f"""You are an expert at matching construction billing emails to work order data for a general contractor.
 
@@ -138,7 +141,7 @@ Begin analysis:"""
         return prompt
 
     @staticmethod
-    def _format_work_orders(work_orders: List[Dict]) -> str:
+    def format_work_orders(work_orders: List[Dict]) -> str:
         """Format work orders for inclusion in prompt"""
         if not work_orders:
             return "No work orders available"
@@ -210,7 +213,7 @@ Begin analysis:"""
         Returns:
             Simplified prompt string
         """
-        wo_summary = PromptBuilder._format_work_orders(work_orders)
+        wo_summary = PromptBuilder.format_work_orders(work_orders)
         items_text = "\n".join([f"- {item}" for item in email_items])
         
         return f"""Match these billing items to work orders:
@@ -139,6 +139,9 @@ class Config:
     CACHE_WORK_ORDERS = _get_bool('CACHE_WORK_ORDERS', True)
     WORK_ORDER_CACHE_TIMEOUT = _get_int('WORK_ORDER_CACHE_TIMEOUT', 15)
     AUTO_REFRESH_INTERVAL = _get_int('AUTO_REFRESH_INTERVAL', 0)
+    CACHE_MATCHING_RESULTS = _get_bool('CACHE_MATCHING_RESULTS', True)
+    PREFILTER_WORK_ORDERS_BY_AMOUNT = _get_bool('PREFILTER_WORK_ORDERS_BY_AMOUNT', False)
+    PREFILTER_AMOUNT_TOLERANCE = _get_float('PREFILTER_AMOUNT_TOLERANCE', 0.30)
     
     # ============================================================================
     # EXPORT SETTINGS
@@ -312,6 +315,8 @@ def get_config_summary():
         # Data processing
         'work_order_caching': Config.CACHE_WORK_ORDERS,
         'cache_timeout_minutes': Config.WORK_ORDER_CACHE_TIMEOUT,
+        'matching_result_caching': Config.CACHE_MATCHING_RESULTS,
+        'amount_prefilter': Config.PREFILTER_WORK_ORDERS_BY_AMOUNT,
         
         # Export settings
         'default_export_format': Config.DEFAULT_EXPORT_FORMAT,
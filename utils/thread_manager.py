@@ -98,11 +98,18 @@ class ThreadManager:
     
     def __init__(self, max_workers: int = 3):
         self.max_workers = max_workers
-        self._active_tasks: Dict[str, WorkerTask] = {}
+        self._active_tasks: Dict[str, WorkerTask] = {}  # Queued or running tasks, removed once finished
+        self._completed_count = 0  # Tallies of finished tasks for get_stats
+        self._successful_count = 0
+        self._failed_count = 0
         self._result_queue = queue.Queue()
         self._task_lock = threading.Lock()
         self._active_threads = ThreadSafeCounter()
         self._shutdown = False
+        # Persistent daemon worker threads fed from a queue, reused across tasks instead of starting
+        # a thread per task (daemon so a hung API call never blocks application exit)
+        self._work_queue = queue.Queue()
+        self._workers = []
         
         logger.info(f"ThreadManager initialized with {max_workers} max workers")
     
@@ -138,24 +145,17 @@ class ThreadManager:
             logger.warning(f"Cannot submit task {task_id} - at maximum capacity ({self.max_workers})")
             return False
         
-        # Check if task ID already exists
+        # Create the task and register it before queueing, so a queued task is already visible
+        # to the duplicate check, cancel_task and get_task_status
+        task = WorkerTask(task_id, func, args, kwargs)
         with self._task_lock:
             if task_id in self._active_tasks:
-                existing_task = self._active_tasks[task_id]
-                if not existing_task.is_completed:
-                    logger.warning(f"Task {task_id} already running")
-                    return False
-        
-        # Create and start task
-        task = WorkerTask(task_id, func, args, kwargs)
+                logger.warning(f"Task {task_id} already running")
+                return False
+            self._active_tasks[task_id] = task
         
         def worker():
             try:
-                self._active_threads.increment()
-                
-                with self._task_lock:
-                    self._active_tasks[task_id] = task
-                
                 # Execute the task
                 task.execute()
                 
@@ -169,14 +169,46 @@ class ThreadManager:
                 })
                 
             finally:
+                with self._task_lock:
+                    if self._active_tasks.get(task_id) is task:
+                        del self._active_tasks[task_id]
+                    if task.is_completed:
+                        self._completed_count += 1
+                        if task.is_successful:
+                            self._successful_count += 1
+                        if task.error is not None:
+                            self._failed_count += 1
                 self._active_threads.decrement()
         
-        thread = threading.Thread(target=worker, name=f"WorkerTask-{task_id}", daemon=True)
-        thread.start()
+        # Count the task as active from submission so capacity checks see queued tasks too
+        self._active_threads.increment()
+        self._work_queue.put(worker)
+        self._ensure_workers()
         
         logger.info(f"Submitted task {task_id} for background execution")
         return True
     
+    def _ensure_workers(self):
+        """Start another worker thread if every existing one may be busy (up to max_workers)"""
+        with self._task_lock:
+            if len(self._workers) >= min(self.max_workers, self._active_threads.value):
+                return
+            thread = threading.Thread(
+                target=self._worker_loop,
+                name=f"WorkerTask-{len(self._workers) + 1}",
+                daemon=True
+            )
+            self._workers.append(thread)
+        thread.start()
+    
+    def _worker_loop(self):
+        """Run queued tasks until a None sentinel arrives"""
+        while True:
+            worker = self._work_queue.get()
+            if worker is None:
+                break
+            worker()
+    
     def cancel_task(self, task_id: str) -> bool:
         """Cancel a pending task"""
         with self._task_lock:
@@ -200,6 +232,13 @@ class ThreadManager:
                 }
         return None
     
+    def post_to_gui(self, callback: Callable, *args):
+        """
+        Queue a callback to run on the main GUI thread with the next batch of completed tasks
+        Safe to call from worker threads
+        """
+        self._result_queue.put({'callback': callback, 'args': args})
+    
     def process_completed_tasks(self) -> int:
         """
         Process completed tasks and execute callbacks
@@ -214,6 +253,16 @@ class ThreadManager:
             while True:
                 try:
                     result = self._result_queue.get_nowait()
+                    
+                    if 'callback' in result:
+                        # Plain GUI update posted from a worker via post_to_gui
+                        try:
+                            result['callback'](*result['args'])
+                        except Exception as e:
+                            logger.error(f"Error in posted GUI callback: {str(e)}")
+                        processed += 1
+                        continue
+                    
                     task = result['task']
                     
                     logger.debug(f"Processing completed task {result['task_id']}")
@@ -243,10 +292,10 @@ class ThreadManager:
     def get_stats(self) -> Dict[str, Any]:
         """Get thread manager statistics"""
         with self._task_lock:
-            active_count = len([t for t in self._active_tasks.values() if not t.is_completed])
-            completed_count = len([t for t in self._active_tasks.values() if t.is_completed])
-            successful_count = len([t for t in self._active_tasks.values() if t.is_successful])
-            failed_count = len([t for t in self._active_tasks.values() if t.error is not None])
+            active_count = len(self._active_tasks)
+            completed_count = self._completed_count
+            successful_count = self._successful_count
+            failed_count = self._failed_count
         
         return {
             'max_workers': self.max_workers,
@@ -273,6 +322,13 @@ class ThreadManager:
             logger.warning(f"ThreadManager shutdown with {self._active_threads.value} active threads still running")
         else:
             logger.info("ThreadManager shutdown completed successfully")
+        
+        # Let the worker threads exit once they are idle
+        with self._task_lock:
+            worker_count = len(self._workers)
+            self._workers = []
+        for _ in range(worker_count):
+            self._work_queue.put(None)
 
 # Decorator for GUI-safe operations
 def gui_safe(func):